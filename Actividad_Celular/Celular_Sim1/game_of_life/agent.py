@@ -1,5 +1,6 @@
 # FixedAgent: Immobile agents permanently fixed to cells
 from mesa.discrete_space import FixedAgent
+from .rules import neighborhood_code
 
 # Clase Cell hereda de FixedAgent
 class Cell(FixedAgent):
@@ -41,16 +42,29 @@ class Cell(FixedAgent):
         a = 1 if left_state == self.ALIVE else 0
         b = 1 if center_state == self.ALIVE else 0
         c = 1 if right_state == self.ALIVE else 0
-        pattern = f"{a}{b}{c}"
 
-        # Busca en la tabla de reglas el siguiente estado
-        if pattern in ["111", "101", "010", "000"]:
-            self.next_state = self.DEAD
-        else:
-            self.next_state = self.ALIVE
+        # Busca en la tabla de reglas del modelo el siguiente estado
+        self._next_state = int(self.model.rule_table[neighborhood_code(a, b, c)])
 
     # Actualiza el estado de la célula al siguiente estado calculado
     def assume_state(self):
-        if self.next_state is not None:
-            self.state = self.next_state
-            self.next_state = None
+        if self._next_state is not None:
+            self.state = self._next_state
+            self._next_state = None
+
+
+class CellView(Cell):
+    """Cell whose state lives in the model's arrays (backend="numpy" or "bitpacked").
+
+    The agent only keeps its position; reading or writing ``state`` goes
+    through ``model.get_state`` / ``model.set_state`` so the visualization sees
+    the same data that the vectorized step computes.
+    """
+
+    @property
+    def state(self):
+        return self.model.get_state(*self.pos)
+
+    @state.setter
+    def state(self, value):
+        self.model.set_state(*self.pos, value)
@@ -0,0 +1,130 @@
+"""Exporta el diagrama espacio-tiempo fila por fila a un archivo mapeado en memoria.
+
+Cada fila nueva se escribe directo en un np.memmap, así que el diagrama vive
+en el archivo (el sistema operativo pagina a disco) y no en el heap de Python.
+
+Formatos:
+    PBMWriter: imagen PBM binaria (P4), 1 bit por célula, negro = viva. Se
+        abre con cualquier visor de imágenes.
+    NpyWriter: arreglo .npy uint8 (rows, width), se lee con np.load(mmap_mode="r").
+
+Uso con el modelo (la fila superior y cada fila que calcula step):
+    with PBMWriter("diagrama.pbm", width, height) as writer:
+        model = ConwaysGameOfLife(width, height, backend="numpy", headless=True,
+                                  on_row=writer.write)
+        while model.running:
+            model.step()
+
+export_diagram genera diagramas más altos que el grid (p. ej. 10^6
+generaciones) con una ventana fija de CHUNK_ROWS filas que se reutiliza.
+"""
+
+import numpy as np
+
+# Filas que export_diagram calcula antes de copiarlas juntas al archivo
+CHUNK_ROWS = 4096
+
+
+class _DiagramWriter:
+    """Base: un memmap (rows, row_size) que se llena de arriba hacia abajo."""
+
+    def __init__(self, width, rows):
+        self.width = width
+        self.rows = rows
+        self.rows_written = 0
+        self._map = None
+
+    def _encode(self, rows):
+        """Bytes que se guardan para un bloque (n, width); por defecto una célula por byte."""
+        return rows
+
+    def write(self, row):
+        """Escribe la siguiente fila (arreglo 0/1 de largo width)."""
+        self.write_rows(np.asarray(row, dtype=np.uint8)[np.newaxis, :])
+
+    def write_rows(self, rows):
+        """Escribe un bloque (n, width) de filas consecutivas."""
+        end = self.rows_written + len(rows)
+        if end > self.rows:
+            raise ValueError(f"diagram has room for {self.rows} rows, got {end}")
+        self._map[self.rows_written:end] = self._encode(rows)
+        self.rows_written = end
+
+    def flush(self):
+        self._map.flush()
+
+    def close(self):
+        """Escribe a disco y libera el mapa; las filas no escritas quedan en 0."""
+        if self._map is not None:
+            self._map.flush()
+            self._map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class PBMWriter(_DiagramWriter):
+    """Imagen PBM binaria de width x rows, 8 células por byte (bit más alto primero)."""
+
+    def __init__(self, path, width, rows):
+        super().__init__(width, rows)
+        header = f"P4\n{width} {rows}\n".encode("ascii")
+        row_bytes = (width + 7) // 8
+        with open(path, "wb") as handle:
+            handle.write(header)
+            handle.truncate(len(header) + rows * row_bytes)
+        self._map = np.memmap(path, dtype=np.uint8, mode="r+", offset=len(header), shape=(rows, row_bytes))
+
+    def _encode(self, rows):
+        return np.packbits(rows, axis=1)
+
+
+class NpyWriter(_DiagramWriter):
+    """Arreglo .npy uint8 de forma (rows, width), una célula por byte."""
+
+    def __init__(self, path, width, rows):
+        super().__init__(width, rows)
+        self._map = np.lib.format.open_memmap(path, mode="w+", dtype=np.uint8, shape=(rows, width))
+
+
+WRITERS = {"pbm": PBMWriter, "npy": NpyWriter}
+
+
+def export_diagram(path, initial_row, generations, table, fmt="pbm"):
+    """Escribe initial_row y las `generations` filas siguientes sin guardar el diagrama.
+
+    Las filas se calculan en un bloque fijo de CHUNK_ROWS filas (con una
+    columna de relleno a cada lado para el torus) que se vuelca al archivo y
+    se reutiliza, así que la memoria no depende del alto del diagrama.
+    Regresa el número de filas escritas.
+    """
+    if fmt not in WRITERS:
+        raise ValueError(f"fmt must be one of {tuple(WRITERS)}, got {fmt!r}")
+    initial_row = np.asarray(initial_row, dtype=np.uint8)
+    width = initial_row.shape[0]
+    block = np.zeros((CHUNK_ROWS, width + 2), dtype=np.uint8)
+    code = np.empty(width, dtype=np.uint8)
+    block[0, 1:-1] = initial_row
+    block[0, 0], block[0, -1] = initial_row[-1], initial_row[0]
+
+    with WRITERS[fmt](path, width, generations + 1) as writer:
+        writer.write_rows(block[:1, 1:-1])
+        remaining = generations
+        while remaining:
+            count = min(CHUNK_ROWS - 1, remaining)
+            for i in range(1, count + 1):
+                prev, row = block[i - 1], block[i]
+                # code[x] = prev[x-1]*4 + prev[x]*2 + prev[x+1] usando el relleno
+                np.left_shift(prev[:-2], 2, out=code)
+                code |= prev[1:-1] << 1
+                code |= prev[2:]
+                table.take(code, out=row[1:-1])
+                row[0], row[-1] = row[-2], row[1]
+            writer.write_rows(block[1:count + 1, 1:-1])
+            # La última fila calculada es la fila previa del siguiente bloque
+            block[0] = block[count]
+            remaining -= count
+        return writer.rows_written
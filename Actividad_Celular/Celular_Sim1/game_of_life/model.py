@@ -1,15 +1,97 @@
+import numpy as np
 from mesa import Model
 from mesa.discrete_space import OrthogonalMooreGrid
-from .agent import Cell
+from . import bitpack
+from .agent import Cell, CellView
+from .rules import DEFAULT_RULE, rule_table
+
+BACKENDS = ("agents", "numpy", "bitpacked")
 
 
 class ConwaysGameOfLife(Model):
     """Represents the 2-dimensional array of cells in Conway's Game of Life."""
 
-    def __init__(self, width=50, height=50, initial_fraction_alive=0.2, seed=None):
-        """Create a new playing area of (width, height) cells."""
+    def __init__(self, width=50, height=50, initial_fraction_alive=0.2, seed=None, backend="agents", rule=DEFAULT_RULE,
+                 headless=False, on_row=None, rolling=False, on_evict=None):
+        """Create a new playing area of (width, height) cells.
+
+        backend="agents" guarda el estado en cada Cell (comportamiento original).
+        backend="numpy" guarda el estado en ``self.states`` (uint8 de forma
+        (width, height)) y calcula cada fila nueva de forma vectorizada; las
+        células son vistas (CellView) sobre ese arreglo.
+        backend="bitpacked" guarda cada fila en ``self.packed`` (uint64 de forma
+        (height, n_words), 64 células por palabra) y no crea grid ni agentes
+        hasta que un visor llama a ``ensure_agents()``.
+
+        headless=True (con backend "numpy") tampoco crea grid ni agentes: el
+        estado se consulta con ``state_array()`` / ``get_state()`` y los agentes
+        se construyen con ``ensure_agents()`` sólo si un visor los dibuja.
+
+        rule es cualquier regla elemental de Wolfram (0-255); se compila una vez
+        en ``self.rule_table`` y la usan todos los backends.
+
+        on_row, si se da, se llama con la fila superior y con cada fila nueva
+        (arreglo uint8 de largo width) en cuanto se calcula; p. ej. el
+        ``write`` de un escritor de export.py. Recibe una copia, así que puede
+        guardarla aunque el backend o rolling reusen la fila después.
+
+        rolling=True convierte las height filas en un buffer circular: step no
+        se detiene en la fila 0 sino que sigue generando indefinidamente y
+        reusa la fila más vieja. Antes de sobreescribirla se pasa a
+        on_evict (si se da), así que la memoria es O(width * height) sin
+        importar cuántas generaciones se corran. ``window()`` regresa las
+        filas guardadas de la más vieja a la más nueva.
+        """
         super().__init__(seed=seed) # seed es para la aleatoridad pero se dice desde donde de la secuencial se empieza
 
+        if backend not in BACKENDS:
+            raise ValueError(f"backend must be one of {BACKENDS}, got {backend!r}")
+        self.backend = backend
+        self.rule = rule
+        self.rule_table = rule_table(rule)
+        self.width = width
+        self.height = height
+
+        # Mantener referencias a los agentes por posición para acceso directo
+        self.cell_grid = {}
+
+        # La fila que ya fue actualizada (height-1 = fila superior ya inicializada)
+        self.current_row = height - 1
+        # Generaciones calculadas después de la fila inicial
+        self.generation = 0
+
+        if on_evict is not None and not rolling:
+            raise ValueError("on_evict requires rolling=True")
+        self.rolling = rolling
+        self.on_evict = on_evict
+
+        if headless and backend == "agents":
+            raise ValueError("headless requires an array backend ('numpy' or 'bitpacked')")
+        self.headless = headless or backend == "bitpacked"
+
+        if self.headless:
+            # Mismo orden de números aleatorios que el recorrido de all_cells
+            top_row = [self.random.random() < initial_fraction_alive for _ in range(width)]
+            if backend == "bitpacked":
+                self.packed = np.zeros((height, bitpack.n_words(width)), dtype=np.uint64)
+                self.packed[self.current_row] = bitpack.pack_rows(top_row)
+            else:
+                self.states = np.zeros((width, height), dtype=np.uint8)
+                self.states[:, self.current_row] = top_row
+            self.grid = None
+        else:
+            self._init_agents(initial_fraction_alive)
+
+        self.on_row = on_row
+        if on_row is not None:
+            on_row(self.get_row(self.current_row).copy())
+
+        self.running = True
+
+    def _init_agents(self, initial_fraction_alive):
+        """Crea el grid y una Cell (o CellView) por posición con su estado inicial."""
+        width, height = self.width, self.height
+
         """Grid where cells are connected to their 8 neighbors.
 
         Example for two dimensions:
@@ -22,11 +104,12 @@ class ConwaysGameOfLife(Model):
         self.grid = OrthogonalMooreGrid((width, height), capacity=1, torus=True)
         # torus significa que los bordes están unidos para que tengan los 8 vecinos siempre
 
-        # Mantener referencias a los agentes por posición para acceso directo
-        self.cell_grid = {}
-
-        # La fila que ya fue actualizada (height-1 = fila superior ya inicializada)
-        self.current_row = height - 1
+        # Con backend numpy el estado vive en un arreglo y las células sólo lo leen
+        if self.backend == "numpy":
+            self.states = np.zeros((width, height), dtype=np.uint8)
+            cell_class = CellView
+        else:
+            cell_class = Cell
 
         # Inicializar las células en la fila superior (height-1)
         for cell in self.grid.all_cells:
@@ -36,19 +119,17 @@ class ConwaysGameOfLife(Model):
                 if (y == self.current_row and self.random.random() < initial_fraction_alive)
                 else Cell.DEAD
             )
-            self.cell_grid[(x, y)] = Cell(
+            self.cell_grid[(x, y)] = cell_class(
                 self,  # modelo
                 cell,  # celda donde estoy
                 init_state=init_state,
             )
 
-        self.running = True
-
     def step(self):
         """Avanza una fila para cada step. Cada step actualiza la fila siguiente en base a
         los 3 vecinos de la fila anterior usando la tabla de reglas dada.
 
-        Regla (donde 1=Alive, 0=Dead):
+        Regla por defecto, 90 (donde 1=Alive, 0=Dead):
         111 -> 0
         110 -> 1
         101 -> 0
@@ -58,17 +139,38 @@ class ConwaysGameOfLife(Model):
         001 -> 1
         000 -> 0
 
-        Se detiene cuando se alcanza la última fila.
+        Se detiene cuando se alcanza la última fila (salvo con rolling=True).
         """
-        width = self.grid.width
+        width = self.width
 
         # Si ya actualizamos hasta la última fila (fila 0 en el bottom), detenemos la simulación.
-        if self.current_row <= 0:
+        if self.current_row <= 0 and not self.rolling:
             self.running = False
             return
 
         prev_row = self.current_row
-        next_row = prev_row - 1
+        next_row = (prev_row - 1) % self.height
+
+        # Con el buffer lleno, next_row guarda la generación de hace height pasos
+        if self.rolling and self.generation + 1 >= self.height and self.on_evict is not None:
+            self.on_evict(self.get_row(next_row).copy())
+
+        if self.backend == "numpy":
+            self._step_numpy(prev_row, next_row)
+        elif self.backend == "bitpacked":
+            self.packed[next_row] = bitpack.step_rows(self.packed[prev_row], width, self.rule_table)
+        else:
+            self._step_agents(prev_row, next_row)
+
+        # Marcamos que la siguiente fila ya fue actualizada
+        self.current_row = next_row
+        self.generation += 1
+        if self.on_row is not None:
+            self.on_row(self.get_row(next_row).copy())
+
+    def _step_agents(self, prev_row, next_row):
+        """Calcula la fila next_row con los agentes Cell (camino original)."""
+        width = self.width
 
         # Para cada columna calculamos el estado de la celda en la fila siguiente
         for x in range(width):
@@ -98,5 +200,82 @@ class ConwaysGameOfLife(Model):
             next_agent = self.cell_grid[(x, next_row)]
             next_agent.assume_state()
 
-        # Marcamos que la siguiente fila ya fue actualizada
-        self.current_row = next_row
\ No newline at end of file
+    def _step_numpy(self, prev_row, next_row):
+        """Calcula la fila next_row completa a partir de prev_row con np.roll."""
+        prev = self.states[:, prev_row]
+        left = np.roll(prev, 1)  # left[x] = prev[x - 1]
+        right = np.roll(prev, -1)  # right[x] = prev[x + 1]
+        code = (left << 2) | (prev << 1) | right
+        self.states[:, next_row] = self.rule_table[code]
+
+    def get_state(self, x, y):
+        """Estado (0/1) de la célula (x, y), sin importar el backend."""
+        if self.backend == "bitpacked":
+            return bitpack.get_bit(self.packed[y], x)
+        if self.backend == "numpy":
+            return int(self.states[x, y])
+        return self.cell_grid[(x, y)].state
+
+    def set_state(self, x, y, value):
+        """Escribe el estado de la célula (x, y), sin importar el backend."""
+        if self.backend == "bitpacked":
+            bitpack.set_bit(self.packed[y], x, value)
+        elif self.backend == "numpy":
+            self.states[x, y] = value
+        else:
+            self.cell_grid[(x, y)].state = value
+
+    def get_row(self, y):
+        """Fila y completa como arreglo uint8 de largo width."""
+        if self.backend == "numpy":
+            return self.states[:, y]
+        if self.backend == "bitpacked":
+            return bitpack.unpack_rows(self.packed[y], self.width)
+        return np.fromiter((self.cell_grid[(x, y)].state for x in range(self.width)), dtype=np.uint8,
+                           count=self.width)
+
+    def rows_since(self, generation):
+        """Filas y escritas por los steps posteriores a ``generation``, de la más nueva a la más vieja.
+
+        Cada step escribe una sola fila (current_row, también con rolling), así
+        que un visor que recuerda la última generación que dibujó sólo tiene
+        que volver a leer estas filas. Si pasaron height o más generaciones
+        regresa todas.
+        """
+        count = min(max(self.generation - generation, 0), self.height)
+        return [(self.current_row + i) % self.height for i in range(count)]
+
+    def window(self):
+        """Filas guardadas, de la más vieja a la más nueva, como arreglo (n, width).
+
+        Sin rolling es la parte ya calculada del diagrama (de la fila superior
+        hacia abajo); con rolling son las últimas height generaciones.
+        """
+        count = min(self.generation + 1, self.height)
+        rows = [(self.current_row + count - 1 - i) % self.height for i in range(count)]
+        return self.state_array()[:, rows].T
+
+    def state_array(self):
+        """Estado completo como arreglo uint8 de forma (width, height)."""
+        if self.backend == "numpy":
+            return self.states
+        if self.backend == "bitpacked":
+            return bitpack.unpack_rows(self.packed, self.width).T
+        return np.fromiter(
+            (self.cell_grid[(x, y)].state for x in range(self.width) for y in range(self.height)),
+            dtype=np.uint8,
+            count=self.width * self.height,
+        ).reshape(self.width, self.height)
+
+    def ensure_agents(self):
+        """Crea el grid y las CellView la primera vez que un visor las necesita.
+
+        Sólo hace algo en modo headless (siempre lo es backend="bitpacked"); si
+        no, los agentes ya se crearon en el constructor.
+        """
+        if self.grid is not None:
+            return
+        self.grid = OrthogonalMooreGrid((self.width, self.height), capacity=1, torus=True)
+        for cell in self.grid.all_cells:
+            x, y = cell.coordinate
+            self.cell_grid[(x, y)] = CellView(self, cell, init_state=self.get_state(x, y))
\ No newline at end of file
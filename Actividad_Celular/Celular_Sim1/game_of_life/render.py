@@ -0,0 +1,202 @@
+"""Dibujo del autómata para SolaraViz sin agentes ni matplotlib.
+
+make_space_component dibuja un marcador por agente y rehace toda la figura en
+cada step. make_raster_space_component lee ``model.state_array()``, lo
+convierte a un PNG de 1 bit por célula con paleta fija y lo muestra como una
+sola imagen, así que sirve también para grids de 1000x1000 o más. Cada
+sesión guarda un RowPngEncoder y entre frames sólo lee, empaqueta y comprime
+las filas que el modelo escribió desde el frame anterior (``rows_since``).
+"""
+
+import math
+import struct
+import zlib
+
+import numpy as np
+import solara
+from mesa.visualization.utils import update_counter
+
+# 0 = muerta (blanco), 1 = viva (negro), igual que agent_portrayal
+CELL_PALETTE = bytes([255, 255, 255, 0, 0, 0])
+# Tope de píxeles del PNG escalado (un grid de 2000x2000 sin escalar cabe)
+MAX_PIXELS = 4_000_000
+# Módulo de Adler-32 (RFC 1950)
+ADLER_MOD = 65521
+
+
+def _png_chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def _png(width, height, palette, idat):
+    return b"".join([
+        b"\x89PNG\r\n\x1a\n",
+        _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 1, 3, 0, 0, 0)),
+        _png_chunk(b"PLTE", palette),
+        _png_chunk(b"IDAT", idat),
+        _png_chunk(b"IEND", b""),
+    ])
+
+
+def state_to_png(state, scale=1, palette=CELL_PALETTE):
+    """PNG (bytes) de un estado (width, height) de 0/1, con y=height-1 arriba.
+
+    Usa color indexado de 1 bit: cada fila de la imagen es ``np.packbits``
+    de la fila del grid, así que el costo es lineal en el número de células.
+    scale repite cada célula scale x scale píxeles.
+    """
+    rows = np.asarray(state, dtype=np.uint8).T[::-1]
+    if scale > 1:
+        rows = rows.repeat(scale, axis=0).repeat(scale, axis=1)
+    height, width = rows.shape
+    packed = np.packbits(rows, axis=1)
+    # Cada fila del PNG empieza con el byte de filtro 0 (sin filtro)
+    raw = np.zeros((height, packed.shape[1] + 1), dtype=np.uint8)
+    raw[:, 1:] = packed
+    return _png(width, height, palette, zlib.compress(raw.tobytes(), 1))
+
+
+class RowPngEncoder:
+    """PNG como state_to_png, pero reutiliza lo del frame anterior.
+
+    Guarda las scanlines empaquetadas (con su byte de filtro) y, por cada
+    fila del grid, sus scale scanlines comprimidas como un bloque deflate
+    independiente (compresor nuevo + Z_SYNC_FLUSH, así que termina alineado a
+    byte y no depende de los bloques vecinos). También guarda la suma y la
+    suma ponderada de Adler-32 de cada bloque, así que el Adler-32 del IDAT se
+    combina en O(height) sin volver a leer las scanlines.
+
+    encode_rows recibe sólo las filas que cambiaron (p. ej. las de
+    ``model.rows_since``) y re-empaqueta y re-comprime sólo esas: su costo es
+    O(filas cambiadas x width) más O(height) para combinar. Unir los bloques y
+    el CRC del PNG recorren los bytes comprimidos, que son la salida misma.
+    encode recibe el estado completo y compara todo el grid para encontrar
+    las filas que cambiaron, así que es O(width x height).
+    """
+
+    def __init__(self, palette=CELL_PALETTE, level=1):
+        self.palette = palette
+        self.level = level
+        self.changed_rows = 0  # filas del grid re-comprimidas en el último encode
+        self._rows = None  # copia (height, width) del último estado, y=height-1 arriba
+        self._scale = None
+        self._raw = None  # (height, scale, bytes por scanline + 1)
+        self._blocks = None
+        self._sums = None  # por fila: suma de bytes mod ADLER_MOD
+        self._weighted = None  # por fila: suma de (largo - j) * byte j mod ADLER_MOD
+
+    def _reset(self, height, width, scale):
+        self._rows = np.empty((height, width), dtype=np.uint8)
+        self._scale = scale
+        self._raw = np.zeros((height, scale, (width * scale + 7) // 8 + 1), dtype=np.uint8)
+        self._blocks = [b""] * height
+        self._sums = np.zeros(height, dtype=np.int64)
+        self._weighted = np.zeros(height, dtype=np.int64)
+
+    def _block(self, row):
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, -9, 1)
+        return compressor.compress(self._raw[row].tobytes()) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def _write(self, changed, rows):
+        """Re-empaqueta y re-comprime las filas de imagen changed con sus valores rows."""
+        self.changed_rows = changed.size
+        if not changed.size:
+            return
+        scale = self._scale
+        self._rows[changed] = rows
+        packed = np.packbits(rows.repeat(scale, axis=1), axis=1)
+        self._raw[changed, :, 1:] = packed[:, None, :]
+        blocks = self._raw[changed].reshape(changed.size, -1).astype(np.int64)
+        length = blocks.shape[1]
+        self._sums[changed] = blocks.sum(axis=1) % ADLER_MOD
+        self._weighted[changed] = (blocks @ np.arange(length, 0, -1, dtype=np.int64)) % ADLER_MOD
+        for row in changed.tolist():
+            self._blocks[row] = self._block(row)
+
+    def _adler32(self):
+        """Adler-32 de todas las scanlines a partir de las sumas por bloque."""
+        height = len(self._blocks)
+        length = self._raw[0].size
+        a = (1 + int(self._sums.sum())) % ADLER_MOD
+        # El byte j del bloque i queda a (length - j) + (height - 1 - i) * length del final
+        later_blocks = np.arange(height - 1, -1, -1, dtype=np.int64)
+        b = (height * length + int(self._weighted.sum()) + length * int(later_blocks @ self._sums)) % ADLER_MOD
+        return (b << 16) | a
+
+    def _png(self):
+        # Encabezado zlib, bloques, bloque final vacío y Adler-32 de las scanlines
+        idat = b"".join([
+            b"\x78\x01",
+            *self._blocks,
+            b"\x03\x00",
+            struct.pack(">I", self._adler32()),
+        ])
+        height, width = self._rows.shape
+        return _png(width * self._scale, height * self._scale, self.palette, idat)
+
+    def encode(self, state, scale=1):
+        """PNG (bytes) de state; mismo resultado visual que state_to_png."""
+        rows = np.asarray(state, dtype=np.uint8).T[::-1]
+        if self._rows is None or rows.shape != self._rows.shape or scale != self._scale:
+            self._reset(*rows.shape, scale)
+            changed = np.arange(rows.shape[0])
+        else:
+            changed = np.flatnonzero((rows != self._rows).any(axis=1))
+        self._write(changed, rows[changed])
+        return self._png()
+
+    def encode_rows(self, updates):
+        """PNG (bytes) tras reemplazar sólo las filas dadas.
+
+        updates es {y: fila uint8 de largo width} en coordenadas del modelo
+        (y=height-1 arriba). Requiere un encode previo del mismo grid; el
+        resto de las filas queda como en el frame anterior.
+        """
+        if self._rows is None:
+            raise ValueError("encode_rows needs a previous encode() of the full state")
+        height = self._rows.shape[0]
+        ys = list(updates)
+        changed = np.array([height - 1 - y for y in ys], dtype=np.intp)
+        rows = np.array([updates[y] for y in ys], dtype=np.uint8).reshape(len(ys), self._rows.shape[1])
+        self._write(changed, rows)
+        return self._png()
+
+
+def raster_scale(shape, min_pixels=600, max_pixels=MAX_PIXELS):
+    """Factor entero para que el lado más largo mida al menos min_pixels,
+    sin pasar de max_pixels en total (nunca menor que 1)."""
+    width, height = shape
+    longest = max(width, height, 1)
+    cells = max(width * height, 1)
+    return max(1, min(min_pixels // longest, math.isqrt(max_pixels // cells)))
+
+
+def make_raster_space_component(min_pixels=600):
+    """Componente de espacio que dibuja todo el estado como una imagen PNG.
+
+    El primer frame de cada modelo lee ``model.state_array()``; después sólo
+    lee con ``model.get_row`` las filas de ``model.rows_since`` (una por step)
+    y se las pasa a RowPngEncoder.encode_rows, así que el costo de un frame
+    depende de las filas nuevas y no del tamaño del grid (sin agentes ni
+    matplotlib). Los grids chicos se escalan por un entero (ver raster_scale)
+    para que cada célula se vea como un cuadro; en pantalla el lado más largo
+    mide min_pixels y el otro conserva la proporción del grid. Cada sesión
+    tiene su propio RowPngEncoder (solara.use_memo).
+    """
+
+    def raster_space_component(model):
+        update_counter.get()
+        encoder = solara.use_memo(RowPngEncoder, [])
+        # (modelo, generación) del último frame codificado
+        last = solara.use_ref(None)
+        width, height = model.width, model.height
+        if last.current is not None and last.current[0] is model:
+            ys = model.rows_since(last.current[1])
+            png = encoder.encode_rows({y: model.get_row(y) for y in ys})
+        else:
+            png = encoder.encode(model.state_array(), scale=raster_scale((width, height), min_pixels))
+        last.current = (model, model.generation)
+        display_width = max(1, round(min_pixels * width / max(width, height, 1)))
+        return solara.Image(png, width=f"{display_width}px")
+
+    return raster_space_component
@@ -0,0 +1,33 @@
+"""Reglas elementales de Wolfram (0-255) precompiladas en tablas de 8 entradas.
+
+El bit ``code`` del número de regla es el siguiente estado para el vecindario
+con código ``izq*4 + centro*2 + der``. Por ejemplo la regla 90 (la tabla que
+usaba Cell.set_next_state) es 0b01011010:
+
+111 -> 0, 110 -> 1, 101 -> 0, 100 -> 1, 011 -> 1, 010 -> 0, 001 -> 1, 000 -> 0
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+DEFAULT_RULE = 90
+
+
+def neighborhood_code(left_state, center_state, right_state):
+    """Código entero 0-7 del vecindario (izq, centro, der) con estados 0/1."""
+    return (left_state << 2) | (center_state << 1) | right_state
+
+
+@lru_cache(maxsize=None)
+def rule_table(rule=DEFAULT_RULE):
+    """Tabla uint8 de sólo lectura con table[code] = siguiente estado.
+
+    Se calcula una sola vez por regla; el camino por agentes (Cell) y los
+    caminos vectorizados comparten el mismo objeto.
+    """
+    if not 0 <= rule <= 255:
+        raise ValueError(f"rule must be between 0 and 255, got {rule!r}")
+    table = np.array([(rule >> code) & 1 for code in range(8)], dtype=np.uint8)
+    table.flags.writeable = False
+    return table
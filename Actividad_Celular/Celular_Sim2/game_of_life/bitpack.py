@@ -0,0 +1,107 @@
+"""Filas del autómata empaquetadas en bits: 64 células por palabra uint64.
+
+La célula x de una fila vive en la palabra x // 64, bit x % 64. Los bits de
+relleno de la última palabra (x >= width) siempre se mantienen en 0.
+
+La fila siguiente se calcula con corrimientos de palabra completa, llevando
+el bit de acarreo entre palabras vecinas y cerrando el torus (la célula
+width-1 es vecina izquierda de la célula 0).
+"""
+
+import numpy as np
+
+WORD_BITS = 64
+
+_ONE = np.uint64(1)
+_ALL = np.uint64(0xFFFFFFFFFFFFFFFF)
+_TOP = np.uint64(WORD_BITS - 1)
+
+
+def n_words(width):
+    """Número de palabras uint64 necesarias para una fila de `width` células."""
+    return (width + WORD_BITS - 1) // WORD_BITS
+
+
+def tail_mask(width):
+    """Máscara de los bits válidos en la última palabra de la fila."""
+    used = width % WORD_BITS
+    return _ALL if used == 0 else np.uint64((1 << used) - 1)
+
+
+def pack_rows(rows):
+    """Empaqueta un arreglo (..., width) de 0/1 en (..., n_words(width)) uint64."""
+    rows = np.asarray(rows, dtype=np.uint8)
+    width = rows.shape[-1]
+    padded = np.zeros(rows.shape[:-1] + (n_words(width) * WORD_BITS,), dtype=np.uint8)
+    padded[..., :width] = rows
+    packed = np.packbits(padded, axis=-1, bitorder="little")
+    return packed.view("<u8").astype(np.uint64)
+
+
+def unpack_rows(words, width):
+    """Inverso de pack_rows: (..., n_words) uint64 -> (..., width) uint8."""
+    words = np.ascontiguousarray(words, dtype="<u8")
+    bits = np.unpackbits(words.view(np.uint8), axis=-1, bitorder="little")
+    return bits[..., :width]
+
+
+def get_bit(row, x):
+    """Estado (0/1) de la célula x de una fila empaquetada."""
+    return int((row[x // WORD_BITS] >> np.uint64(x % WORD_BITS)) & _ONE)
+
+
+def set_bit(row, x, value):
+    """Escribe el estado de la célula x de una fila empaquetada."""
+    bit = _ONE << np.uint64(x % WORD_BITS)
+    if value:
+        row[x // WORD_BITS] |= bit
+    else:
+        row[x // WORD_BITS] &= ~bit
+
+
+def neighbors(words, width):
+    """Regresa (left, right) donde left[x] = words[x - 1] y right[x] = words[x + 1].
+
+    Funciona sobre el último eje, así que acepta una fila (n_words,) o varias
+    filas apiladas (n_filas, n_words).
+    """
+    last = np.uint64((width - 1) % WORD_BITS)
+
+    left = words << _ONE
+    left[..., 1:] |= words[..., :-1] >> _TOP  # acarreo de la palabra anterior
+    left[..., 0] |= (words[..., -1] >> last) & _ONE  # torus: célula width-1
+
+    right = words >> _ONE
+    right[..., :-1] |= words[..., 1:] << _TOP  # acarreo de la palabra siguiente
+    right[..., -1] |= (words[..., 0] & _ONE) << last  # torus: célula 0
+    return left, right
+
+
+def step_rows(words, width, table):
+    """Aplica la tabla de reglas (8 entradas, índice izq*4 + centro*2 + der) una vez.
+
+    La regla se evalúa como un OR de los mintérminos cuyo resultado es 1,
+    usando sólo AND/OR/NOT (y XOR cuando la tabla es la regla 90).
+    """
+    left, right = neighbors(words, width)
+    if tuple(int(v) for v in table) == (0, 1, 0, 1, 1, 0, 1, 0):
+        out = left ^ right
+    else:
+        out = np.zeros_like(words)
+        for code in range(8):
+            if not table[code]:
+                continue
+            term = np.full_like(words, _ALL)
+            term &= left if code & 4 else ~left
+            term &= words if code & 2 else ~words
+            term &= right if code & 1 else ~right
+            out |= term
+    out[..., -1] &= tail_mask(width)  # los bits de relleno siempre en 0
+    return out
+
+
+def advance(words, width, table, generations):
+    """Avanza una fila (o un bloque de filas) `generations` veces."""
+    for _ in range(generations):
+        words = step_rows(words, width, table)
+    return words
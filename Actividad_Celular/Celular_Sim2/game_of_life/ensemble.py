@@ -0,0 +1,202 @@
+"""Corre muchos ConwaysGameOfLife (una malla de parámetros x seeds) en paralelo.
+
+Uso (desde Celular_Sim2/):
+    python -m game_of_life.ensemble --width 50 100 --height 50 \\
+        --fraction 0.2 0.5 --seeds 0-999 --max-steps 500 --output ensemble_results
+
+Cada corrida se ejecuta en un ProcessPoolExecutor y su resumen se agrega a
+``--output`` en cuanto termina. La salida es el mismo directorio columnar que
+usa benchmarks/sweep.py: un archivo binario de ancho fijo por columna
+(``<columna>.bin``) más ``schema.json``. Si se vuelve a lanzar con la misma
+salida, las corridas que ya están se saltan. Sólo hay unas cuantas corridas
+pendientes a la vez, así que la memoria no depende del tamaño de la malla.
+
+Para leer los resultados: ``ColumnStore("ensemble_results").to_dataframe()``.
+"""
+
+import argparse
+import itertools
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+import numpy as np
+
+from .model import ConwaysGameOfLife
+from .rules import DEFAULT_RULE
+
+# Columna -> dtype; KEY_FIELDS identifican una corrida (para reanudar)
+FIELDS = {
+    "width": "<i8",
+    "height": "<i8",
+    "initial_fraction_alive": "<f8",
+    "seed": "<i8",
+    "rule": "<i8",
+    "steps": "<i8",
+    "final_density": "<f8",
+    # NaN si la corrida no llegó a un ciclo
+    "transient_length": "<f8",
+    "cycle_period": "<f8",
+}
+KEY_FIELDS = ["width", "height", "initial_fraction_alive", "seed", "rule"]
+
+
+class ColumnStore:
+    """
+    Tabla columnar sólo de agregar: un archivo .bin de ancho fijo por columna.
+
+    Mismo formato que benchmarks/sweep.py. Si el proceso se corta a la mitad
+    de una fila, al abrir se recortan todas las columnas a la última completa.
+    """
+    def __init__(self, path, dtypes=None):
+        """
+        args:
+            path: Directorio de la tabla
+            dtypes: {columna: dtype} para crearla; si ya existe debe coincidir
+        """
+        self.path = Path(path)
+        schema_path = self.path / "schema.json"
+        if schema_path.exists():
+            schema = json.loads(schema_path.read_text())
+            if dtypes is not None and schema != dict(dtypes):
+                raise ValueError(f"{self.path} already has columns {schema}, got {dict(dtypes)}")
+            dtypes = schema
+        elif dtypes is None:
+            raise ValueError(f"{self.path} has no schema.json")
+        else:
+            self.path.mkdir(parents=True, exist_ok=True)
+            schema_path.write_text(json.dumps(dict(dtypes), indent=1))
+        self.dtypes = {name: np.dtype(dtype) for name, dtype in dtypes.items()}
+        self.rows = self._repair()
+
+    def _file(self, name):
+        return self.path / f"{name}.bin"
+
+    def _repair(self):
+        """Recorta las columnas a la última fila completa y regresa cuántas hay."""
+        sizes = {}
+        for name, dtype in self.dtypes.items():
+            file = self._file(name)
+            sizes[name] = file.stat().st_size // dtype.itemsize if file.exists() else 0
+        rows = min(sizes.values(), default=0)
+        for name, dtype in self.dtypes.items():
+            file = self._file(name)
+            if not file.exists():
+                file.touch()
+            if file.stat().st_size != rows * dtype.itemsize:
+                os.truncate(file, rows * dtype.itemsize)
+        return rows
+
+    def append(self, row):
+        """Agrega una fila {columna: valor}."""
+        for name, dtype in self.dtypes.items():
+            with open(self._file(name), "ab") as handle:
+                handle.write(np.array(row[name], dtype=dtype).tobytes())
+        self.rows += 1
+
+    def column(self, name):
+        """Arreglo de NumPy con la columna completa."""
+        return np.fromfile(self._file(name), dtype=self.dtypes[name], count=self.rows)
+
+    def to_dataframe(self):
+        import pandas as pd
+
+        return pd.DataFrame({name: self.column(name) for name in self.dtypes})
+
+
+def run_key(row):
+    """Llave de una corrida, con los valores ya convertidos al dtype de su columna."""
+    return tuple(np.array(row[name], dtype=FIELDS[name]).item() for name in KEY_FIELDS)
+
+
+def parse_seeds(text):
+    """'0-9' -> range(0, 10); '1,5,7' -> [1, 5, 7]."""
+    if "-" in text:
+        start, end = text.split("-")
+        return range(int(start), int(end) + 1)
+    return [int(seed) for seed in text.split(",")]
+
+
+def parameter_grid(widths, heights, fractions, seeds):
+    """Genera (perezosamente) un diccionario de kwargs por combinación."""
+    for width, height, fraction, seed in itertools.product(widths, heights, fractions, seeds):
+        yield {"width": width, "height": height, "initial_fraction_alive": fraction, "seed": seed}
+
+
+def run_one(params, max_steps, backend="numpy", rule=DEFAULT_RULE, detect_cycles=True):
+    """Corre un modelo headless hasta que se detiene o llega a max_steps."""
+    model = ConwaysGameOfLife(
+        **params,
+        backend=backend,
+        rule=rule,
+        headless=backend != "agents",
+        detect_cycles=detect_cycles,
+    )
+    while model.running and model.steps < max_steps:
+        model.step()
+    return {
+        **params,
+        "rule": rule,
+        "steps": model.steps,
+        "final_density": float(model.state_array().mean()),
+        "transient_length": np.nan if model.transient_length is None else model.transient_length,
+        "cycle_period": np.nan if model.cycle_period is None else model.cycle_period,
+    }
+
+
+def run_ensemble(grid, output, max_steps, workers=None, max_pending=None, **run_kwargs):
+    """Reparte las corridas de grid entre procesos y agrega cada resumen al terminar.
+
+    Las corridas que ya están en output se saltan. Regresa el número de
+    corridas escritas.
+    """
+    store = ColumnStore(output, FIELDS)
+    rule = run_kwargs.get("rule", DEFAULT_RULE)
+    done = set(zip(*(store.column(name).tolist() for name in KEY_FIELDS)))
+    grid = (params for params in grid if run_key({**params, "rule": rule}) not in done)
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 4 * workers
+    done_count = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        while True:
+            # Llenar la ventana de corridas pendientes sin expandir toda la malla
+            for params in itertools.islice(grid, max_pending - len(pending)):
+                pending.add(pool.submit(run_one, params, max_steps, **run_kwargs))
+            if not pending:
+                break
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                store.append(future.result())
+                done_count += 1
+    return done_count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ensemble de ConwaysGameOfLife en paralelo")
+    parser.add_argument("--width", type=int, nargs="+", default=[50])
+    parser.add_argument("--height", type=int, nargs="+", default=[50])
+    parser.add_argument("--fraction", type=float, nargs="+", default=[0.2])
+    parser.add_argument("--seeds", type=parse_seeds, default=range(10))
+    parser.add_argument("--max-steps", type=int, default=500)
+    parser.add_argument("--rule", type=int, default=DEFAULT_RULE)
+    parser.add_argument("--backend", default="numpy", choices=["agents", "numpy", "bitpacked"])
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default="ensemble_results")
+    args = parser.parse_args(argv)
+
+    grid = parameter_grid(args.width, args.height, args.fraction, args.seeds)
+    count = run_ensemble(
+        grid,
+        args.output,
+        args.max_steps,
+        workers=args.workers,
+        backend=args.backend,
+        rule=args.rule,
+    )
+    print(f"{count} corridas escritas en {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,102 @@
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
 from mesa import Model
 from mesa.discrete_space import OrthogonalMooreGrid
-from .agent import Cell
+from . import bitpack
+from .agent import Cell, CellView
+from .hashlife import HashlifeEngine, int_to_row, row_to_int
+from .rules import DEFAULT_RULE, rule_table
+
+BACKENDS = ("agents", "numpy", "bitpacked", "hashlife")
 
 
 class ConwaysGameOfLife(Model):
     """Represents the 2-dimensional array of cells in Conway's Game of Life."""
 
-    def __init__(self, width=50, height=50, initial_fraction_alive=0.2, seed=None):
-        """Create a new playing area of (width, height) cells."""
+    def __init__(self, width=50, height=50, initial_fraction_alive=0.2, seed=None, backend="agents", rule=DEFAULT_RULE,
+                 detect_cycles=False, cycle_history=1024, step_exponent=0, hashlife_cache_size=1 << 16,
+                 headless=False):
+        """Create a new playing area of (width, height) cells.
+
+        backend="agents" guarda el estado en cada Cell (comportamiento original).
+        backend="numpy" guarda el estado en ``self.states`` (uint8 de forma
+        (width, height)) y actualiza toda la cuadrícula en una sola operación
+        por step; las células son vistas (CellView) sobre ese arreglo. Para la
+        misma seed ambos backends producen exactamente los mismos estados.
+        backend="bitpacked" guarda cada fila en ``self.packed`` (uint64 de forma
+        (height, n_words), 64 células por palabra) y no crea grid ni agentes
+        hasta que un visor llama a ``ensure_agents()``.
+        backend="hashlife" guarda cada fila como entero en ``self.rows`` y cada
+        step avanza 2^step_exponent generaciones con bloques memorizados
+        (ver hashlife.py); ``hashlife_cache_size`` acota su caché. Tampoco crea
+        agentes hasta ``ensure_agents()``.
+
+        headless=True (con backend "numpy") tampoco crea grid ni agentes: el
+        estado se consulta con ``state_array()`` / ``get_state()`` y los agentes
+        se construyen con ``ensure_agents()`` sólo si un visor los dibuja.
+
+        rule es cualquier regla elemental de Wolfram (0-255); se compila una vez
+        en ``self.rule_table`` y la usan todos los backends.
+
+        detect_cycles=True guarda un hash de cada estado (los últimos
+        cycle_history) y detiene el modelo en cuanto un estado se repite. Al
+        detenerse quedan ``transient_length`` (steps antes de entrar al ciclo) y
+        ``cycle_period`` (1 = punto fijo), ambos contados en steps del modelo.
+        Ciclos más largos que cycle_history no se detectan.
+        """
         super().__init__(seed=seed) # seed es para la aleatoridad pero se dice desde donde de la secuencial se empieza
 
+        if backend not in BACKENDS:
+            raise ValueError(f"backend must be one of {BACKENDS}, got {backend!r}")
+        if step_exponent and backend != "hashlife":
+            raise ValueError("step_exponent requires backend='hashlife'")
+        self.backend = backend
+        self.rule = rule
+        self.rule_table = rule_table(rule)
+        self.width = width
+        self.height = height
+        self.step_exponent = step_exponent
+        self.generations_per_step = 1 << step_exponent
+        self.cell_grid = {}  # Para acceso rápido a los agentes por posición
+
+        if headless and backend == "agents":
+            raise ValueError("headless requires an array backend ('numpy', 'bitpacked' or 'hashlife')")
+        self.headless = headless or backend in ("bitpacked", "hashlife")
+
+        if self.headless:
+            # Mismo orden de números aleatorios que el recorrido de all_cells (x, luego y)
+            init = np.array(
+                [[self.random.random() < initial_fraction_alive for _ in range(height)] for _ in range(width)],
+                dtype=np.uint8,
+            )
+            if backend == "numpy":
+                self.states = init
+            elif backend == "bitpacked":
+                self.packed = bitpack.pack_rows(init.T)
+            else:
+                self.engine = HashlifeEngine(self.rule_table, cache_size=hashlife_cache_size)
+                self.rows = [row_to_int(row) for row in init.T]
+            self.grid = None
+        else:
+            self._init_agents(initial_fraction_alive)
+
+        self.running = True
+
+        # Detección de ciclos: hash del estado -> step en que se vio por primera vez
+        self.detect_cycles = detect_cycles
+        self.cycle_history = cycle_history
+        self.transient_length = None
+        self.cycle_period = None
+        self._seen_states = OrderedDict()
+        if detect_cycles:
+            self._record_state()
+
+    def _init_agents(self, initial_fraction_alive):
+        """Crea el grid y una Cell (o CellView) por posición con su estado inicial."""
+        width, height = self.width, self.height
+
         """Grid where cells are connected to their 8 neighbors.
 
         Example for two dimensions:
@@ -21,7 +108,13 @@ class ConwaysGameOfLife(Model):
         """
         self.grid = OrthogonalMooreGrid((width, height), capacity=1, torus=True)
         # torus significa que los bordes están unidos para que tengan los 8 vecinos siempre
-        self.cell_grid = {}  # Para acceso rápido a los agentes por posición
+
+        # Con backend numpy el estado vive en un arreglo y las células sólo lo leen
+        if self.backend == "numpy":
+            self.states = np.zeros((width, height), dtype=np.uint8)
+            cell_class = CellView
+        else:
+            cell_class = Cell
 
         # Inicializar las células en la fila superior (height-1)
         for cell in self.grid.all_cells:
@@ -31,20 +124,33 @@ class ConwaysGameOfLife(Model):
                 if (self.random.random() < initial_fraction_alive)
                 else Cell.DEAD
             )
-            self.cell_grid[(x, y)] = Cell(
+            self.cell_grid[(x, y)] = cell_class(
                 self,  # modelo
                 cell,  # celda donde estoy
                 init_state=init_state,
             )
 
-        self.running = True
-
     def step(self):
         """Avanza una fila para cada step. Cada step actualiza la fila siguiente en base a
         los 3 vecinos de la fila anterior usando la tabla de reglas dada."""
-        # 
-        width = self.grid.width
-        height = self.grid.height
+        if self.backend == "numpy":
+            self._step_numpy()
+        elif self.backend == "bitpacked":
+            above = np.roll(self.packed, -1, axis=0)  # fila y toma la fila y+1
+            self.packed = bitpack.step_rows(above, self.width, self.rule_table)
+        elif self.backend == "hashlife":
+            self._step_hashlife()
+        else:
+            self._step_agents()
+
+        # Una vez encontrado el ciclo se conservan transient_length y cycle_period
+        if self.detect_cycles and self.cycle_period is None:
+            self._record_state()
+
+    def _step_agents(self):
+        """Camino original: cada Cell calcula su siguiente estado y luego lo asume."""
+        width = self.width
+        height = self.height
 
         # Calcula los siguientes estados para cada célula
         for agent in self.agents:
@@ -66,4 +172,92 @@ class ConwaysGameOfLife(Model):
 
         # Actualiza todos los agentes al siguiente estado calculado
         for agent in self.agents:
-            agent.assume_state()
\ No newline at end of file
+            agent.assume_state()
+
+    def _step_numpy(self):
+        """Actualiza toda la cuadrícula en una operación: cada fila y toma la
+        regla aplicada a la fila y+1 (torus)."""
+        above = np.roll(self.states, -1, axis=1)  # above[:, y] = states[:, y + 1]
+        left = np.roll(above, 1, axis=0)  # left[x] = above[x - 1]
+        right = np.roll(above, -1, axis=0)  # right[x] = above[x + 1]
+        code = (left << 2) | (above << 1) | right
+        self.states[...] = self.rule_table[code]
+
+    def _step_hashlife(self):
+        """Avanza 2^step_exponent generaciones: tras T generaciones la fila y es
+        la fila y+T (torus) avanzada T veces con la regla."""
+        shift = self.generations_per_step % self.height
+        source = self.rows[shift:] + self.rows[:shift]
+        self.rows = [self.engine.advance(row, self.width, self.step_exponent) for row in source]
+
+    def _packed_state(self):
+        """Bytes con el estado completo de la cuadrícula (1 bit por célula)."""
+        if self.backend == "bitpacked":
+            return self.packed.tobytes()
+        if self.backend == "numpy":
+            return np.packbits(self.states).tobytes()
+        if self.backend == "hashlife":
+            n_bytes = (self.width + 7) // 8
+            return b"".join(row.to_bytes(n_bytes, "little") for row in self.rows)
+        return np.packbits(self.state_array()).tobytes()
+
+    def _record_state(self):
+        """Guarda el hash del estado actual; si ya se había visto, detiene el modelo."""
+        digest = hashlib.blake2b(self._packed_state(), digest_size=16).digest()
+        first_seen = self._seen_states.get(digest)
+        if first_seen is not None:
+            self.transient_length = first_seen
+            self.cycle_period = self.steps - first_seen
+            self.running = False
+            return
+        self._seen_states[digest] = self.steps
+        if len(self._seen_states) > self.cycle_history:
+            self._seen_states.popitem(last=False)  # olvida el estado más antiguo
+
+    def get_state(self, x, y):
+        """Estado (0/1) de la célula (x, y), sin importar el backend."""
+        if self.backend == "bitpacked":
+            return bitpack.get_bit(self.packed[y], x)
+        if self.backend == "hashlife":
+            return (self.rows[y] >> x) & 1
+        if self.backend == "numpy":
+            return int(self.states[x, y])
+        return self.cell_grid[(x, y)].state
+
+    def set_state(self, x, y, value):
+        """Escribe el estado de la célula (x, y), sin importar el backend."""
+        if self.backend == "bitpacked":
+            bitpack.set_bit(self.packed[y], x, value)
+        elif self.backend == "hashlife":
+            self.rows[y] = self.rows[y] | (1 << x) if value else self.rows[y] & ~(1 << x)
+        elif self.backend == "numpy":
+            self.states[x, y] = value
+        else:
+            self.cell_grid[(x, y)].state = value
+
+    def state_array(self):
+        """Estado completo como arreglo uint8 de forma (width, height)."""
+        if self.backend == "numpy":
+            return self.states
+        if self.backend == "bitpacked":
+            return bitpack.unpack_rows(self.packed, self.width).T
+        if self.backend == "hashlife":
+            return np.array([int_to_row(row, self.width) for row in self.rows]).T
+        return np.fromiter(
+            (self.cell_grid[(x, y)].state for x in range(self.width) for y in range(self.height)),
+            dtype=np.uint8,
+            count=self.width * self.height,
+        ).reshape(self.width, self.height)
+
+    def ensure_agents(self):
+        """Crea el grid y las CellView la primera vez que un visor las necesita.
+
+        Sólo hace algo en modo headless (siempre lo son "bitpacked" y
+        "hashlife"); si no, los agentes ya se crearon en el constructor.
+        """
+        if self.grid is not None:
+            return
+        self.grid = OrthogonalMooreGrid((self.width, self.height), capacity=1, torus=True)
+        for cell in self.grid.all_cells:
+            x, y = cell.coordinate
+            self.cell_grid[(x, y)] = CellView(self, cell, init_state=self.get_state(x, y))
\ No newline at end of file
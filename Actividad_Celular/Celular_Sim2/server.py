@@ -1,23 +1,9 @@
 from game_of_life.model import ConwaysGameOfLife
+from game_of_life.render import make_raster_space_component # Todo el estado como una sola imagen
 from mesa.visualization import (
     SolaraViz, # Varias pestañas con diferentes visualizaciones
-    make_space_component, # Para crear un componente de espacio (grid)
 )
 
-from mesa.visualization.components import AgentPortrayalStyle
-
-def agent_portrayal(agent):
-    return AgentPortrayalStyle(
-        color="white" if agent.state == 0 else "black",
-        marker="s", # square
-        size=30,
-    )
-
-def post_process(ax):
-    ax.set_aspect("equal")
-    ax.set_xticks([])
-    ax.set_yticks([])
-
 model_params = {
     "seed": {
         "type": "InputText",
@@ -29,7 +15,7 @@ model_params = {
         "value": 50,
         "label": "Width",
         "min": 5,
-        "max": 60,
+        "max": 2000,
         "step": 1,
     },
     "height": {
@@ -37,7 +23,7 @@ model_params = {
         "value": 50,
         "label": "Height",
         "min": 5,
-        "max": 60,
+        "max": 2000,
         "step": 1,
     },
     "initial_fraction_alive": {
@@ -48,16 +34,16 @@ model_params = {
         "max": 1,
         "step": 0.01,
     },
+    # Estado en arreglo NumPy; la imagen lo lee sin crear células
+    "backend": "numpy",
+    "headless": True,
 }
 
 # Create initial model instance
-gof_model = ConwaysGameOfLife()
+gof_model = ConwaysGameOfLife(backend="numpy", headless=True)
 
-space_component = make_space_component(
-        agent_portrayal,
-        draw_grid = False,
-        post_process=post_process
-)
+# Lee model.state_array() directamente: no construye agentes ni usa matplotlib
+space_component = make_raster_space_component()
 
 page = SolaraViz( # Controla el modelo
     gof_model,
@@ -0,0 +1,92 @@
+"""Memoria por célula y tiempo de construcción de cada forma de guardar el estado.
+
+Uso (desde Actividad_Celular/):
+    python benchmarks/cell_memory.py --sim Celular_Sim2 --cells 1000000
+
+Compara ConwaysGameOfLife con:
+    Cell       backend="agents": un agente por célula con el estado adentro
+    CellView   backend="numpy": agentes que sólo leen ``model.states``
+    headless   backend="numpy", headless=True: sin grid ni agentes
+    bitpacked  backend="bitpacked": 64 células por palabra uint64
+
+El tiempo se mide construyendo el modelo con --cells células sin tracemalloc;
+los bytes por célula se miden con tracemalloc sobre --memory-cells (la memoria
+crece linealmente, así que no hace falta rastrear el millón completo).
+
+No hay una variante de Cell con ``__slots__``: Agent de Mesa no los declara,
+así que toda subclase conserva su ``__dict__`` (model, unique_id, pos, cell) y
+mover state/_next_state a slots ahorra ~8 bytes de ~530 por agente. Si no se
+van a dibujar agentes, la forma compacta es headless (o bitpacked); con
+``ensure_agents()`` un visor crea las CellView sólo cuando las necesita.
+"""
+
+import argparse
+import gc
+import math
+import sys
+import time
+import tracemalloc
+import warnings
+from pathlib import Path
+
+# nombre -> kwargs de ConwaysGameOfLife
+VARIANTS = {
+    "Cell": {"backend": "agents"},
+    "CellView": {"backend": "numpy"},
+    "headless": {"backend": "numpy", "headless": True},
+    "bitpacked": {"backend": "bitpacked"},
+}
+
+
+def load_sim(name):
+    """Importa ConwaysGameOfLife desde la carpeta de la simulación indicada."""
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent / name))
+    from game_of_life.model import ConwaysGameOfLife
+    return ConwaysGameOfLife
+
+
+def build(model_class, n_cells, kwargs):
+    side = math.isqrt(n_cells)
+    return model_class(width=side, height=side, seed=1, **kwargs)
+
+
+def time_construction(model_class, n_cells, kwargs):
+    gc.collect()
+    gc.disable()  # como timeit: que una recolección no caiga en una sola variante
+    start = time.perf_counter()
+    model = build(model_class, n_cells, kwargs)
+    elapsed = time.perf_counter() - start
+    gc.enable()
+    return model.width * model.height, len(model.agents), elapsed
+
+
+def bytes_per_cell(model_class, n_cells, kwargs):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    model = build(model_class, n_cells, kwargs)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / (model.width * model.height)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sim", default="Celular_Sim2", choices=["Celular_Sim1", "Celular_Sim2"])
+    parser.add_argument("--cells", type=int, default=1_000_000)
+    parser.add_argument("--memory-cells", type=int, default=100_000)
+    parser.add_argument("--variants", nargs="+", default=list(VARIANTS), choices=list(VARIANTS))
+    args = parser.parse_args(argv)
+
+    warnings.simplefilter("ignore")
+    model_class = load_sim(args.sim)
+    print(f"{'variant':<10} {'cells':>10} {'agents':>10} {'build s':>9} {'us/cell':>9} {'bytes/cell':>11}")
+    for name in args.variants:
+        kwargs = VARIANTS[name]
+        cells, agents, elapsed = time_construction(model_class, args.cells, kwargs)
+        size = bytes_per_cell(model_class, args.memory_cells, kwargs)
+        print(f"{name:<10} {cells:>10} {agents:>10} {elapsed:>9.2f} {1e6 * elapsed / cells:>9.2f} {size:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
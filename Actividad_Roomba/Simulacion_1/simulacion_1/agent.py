@@ -11,19 +11,33 @@ class ObstacleAgent(FixedAgent):
     def __init__(self, model, cell):
         super().__init__(model)
         self.cell=cell
+        model.occupancy.obstacle[cell.coordinate] = True
+        # Si el mapa de navegación ya existe, el mapa de obstáculos cambió
+        navigation = getattr(model, "navigation", None)
+        if navigation is not None:
+            navigation.set_obstacle(cell.coordinate)
 
     def step(self):
         pass
 
 class DirtyPatch(FixedAgent):
     """
-    Celda que puede estar sucia o limpia
+    Celda que puede estar sucia o limpia. La suciedad vive en la capa
+    model.occupancy.dirty; el agente sólo la lee y escribe (se usa para dibujar)
     """
     def __init__(self, model, cell, dirty=True):
         super().__init__(model)
         self.cell = cell
         self.dirty = dirty # True si está sucia, False si está limpia
 
+    @property
+    def dirty(self):
+        return bool(self.model.occupancy.dirty[self.cell.coordinate])
+
+    @dirty.setter
+    def dirty(self, value):
+        self.model.occupancy.dirty[self.cell.coordinate] = value
+
     def step(self):
         pass
 
@@ -34,6 +48,10 @@ class ChargingStation(FixedAgent):
     def __init__(self, model, cell):
         super().__init__(model)
         self.cell = cell
+        model.occupancy.charger[cell.coordinate] = True
+        navigation = getattr(model, "navigation", None)
+        if navigation is not None:
+            navigation.chargers_changed()
 
     def step(self):
         pass
@@ -62,6 +80,7 @@ class RandomAgent(CellAgent):
         self.visited = set()
         if hasattr(self.cell, "coordinate"):
             self.visited.add(self.cell.coordinate)
+        model.occupancy.robots[cell.coordinate] += 1
 
     # @property permite acceder al método como si fuera un atributo
     @property
@@ -69,24 +88,25 @@ class RandomAgent(CellAgent):
         """
         Verifica si el agente está localizado en mi estación de recarga
         """
-        return any(isinstance(a, ChargingStation) for a in self.cell.agents)
+        return self.model.occupancy.is_charger(self.cell.coordinate)
     
     def neighbors_without_obstacles(self):
         """
         Regresa las celdas vecinas que no tiene obstaculos
+        (lista de Cell en el orden de cell.neighborhood)
         """
-        neighbors = self.cell.neighborhood
-        freeCell = neighbors.select(
-            lambda cell: not any(isinstance(a, ObstacleAgent) for a in cell.agents)
-        )
-        return freeCell
+        navigation = self.model.navigation
+        return [navigation.cells[i] for i in navigation.walkable_neighbors(self.cell.coordinate)]
     
     def distance_to_charger(self, cell = None):
         """
         Calcula la distancia que falta para llegar a la estación de recarga
+        (con routing="field": los pasos reales por el campo de distancias)
         """
         if cell is None:
             cell = self.cell
+        if self.model.routing == "field":
+            return self.model.navigation.charger_distance(cell.coordinate)
         x, y = cell.coordinate
         chargerX, chargerY = self.model.charger_location
         return abs(x - chargerX) + abs(y - chargerY)
@@ -102,6 +122,7 @@ class RandomAgent(CellAgent):
         """Actualizar posición y métricas al moverse a new_cell (Cell object)"""
         if new_cell is None:
             return
+        self.model.occupancy.move_robot(self.cell.coordinate, new_cell.coordinate)
         self.cell = new_cell
         self.battery = max(0, self.battery - 1)
         self.move_count += 1
@@ -111,10 +132,51 @@ class RandomAgent(CellAgent):
         if hasattr(self.cell, "coordinate"):
             self.visited.add(self.cell.coordinate)
 
+    def next_step_to_charger(self):
+        """
+        Siguiente coordenada de la ruta A* hacia el cargador, o None si ya
+        llegó o no hay ruta. Las rutas se guardan en model.navigation.next_hop
+        por (coordenada, cargador), así que sólo se planea al salir de una ruta conocida
+        """
+        navigation = self.model.navigation
+        start, goal = self.cell.coordinate, self.model.charger_location
+        key = (start, goal)
+        if key not in navigation.next_hop:
+            path = self.astar_path(
+                start,
+                goal,
+                navigation.cells_by_coord,
+                is_blocked=navigation.is_blocked,
+                heuristica=lambda a, b: max(abs(a[0]-b[0]), abs(a[1]-b[1])),
+                vecinos=navigation.walkable_neighbor_coords,
+            )
+            if path is None:
+                navigation.next_hop[key] = None
+            else:
+                navigation.store_path(path, goal)
+        return navigation.next_hop[key]
+
+    def move_along_route(self):
+        """
+        Da un paso por la ruta A* al cargador. Regresa False si no hay ruta o
+        si la siguiente celda no está libre
+        """
+        target = self.next_step_to_charger()
+        if target is None:
+            return False
+        for cell in self.neighbors_without_obstacles():
+            if cell.coordinate == target:
+                self.movement(cell)
+                return True
+        return False
+
     def move_towards_charger(self):
-        """Selecciona la vecina que reduce la distancia Manhattan al cargador y se mueve"""
+        """Selecciona la vecina que reduce la distancia Manhattan al cargador y se mueve
+        (con routing="astar" primero intenta seguir la ruta A*)"""
+        if self.model.routing == "astar" and self.move_along_route():
+            return
         freeCell = self.neighbors_without_obstacles()
-        if len(freeCell) == 0:
+        if not freeCell:
             return
         best = None
         best_dist = None
@@ -124,9 +186,13 @@ class RandomAgent(CellAgent):
                 best_dist = d
                 best = c
         if best is not None:
+            # Con el campo de distancias sólo se baja (si no, no hay camino al cargador)
+            if self.model.routing == "field" and best_dist >= self.distance_to_charger():
+                return
             self.movement(best)
     
-    def astar_path(start, goal, cells_by_coord, is_blocked=None, heuristica=None):
+    @staticmethod
+    def astar_path(start, goal, cells_by_coord, is_blocked=None, heuristica=None, vecinos=None):
         """
         Función A* sobre coordenadas en una grilla.
         Args:
@@ -135,6 +201,8 @@ class RandomAgent(CellAgent):
             cells_by_coord: Diccionario que mapea coordenadas a objetos Cell
             is_blocked: Función que recibe una coordenada y devuelve True si está bloqueada
             heuristic: Función heurística que recibe dos coordenadas y devuelve una estimación de costo
+            vecinos: Función que recibe una coordenada y devuelve sus vecinas
+                     (por defecto las 4 ortogonales que están en cells_by_coord)
         """
 
         if start == goal:
@@ -148,9 +216,13 @@ class RandomAgent(CellAgent):
             heuristica = lambda a, b: abs(a[0]-b[0]) + abs(a[1]-b[1])
 
         def neighbors(coordinada):
-            x, y = coordinada
-            for n in ((x+1,y),(x-1,y),(x,y+1),(x,y-1)):
-                if n in cells_by_coord and not is_blocked(n):
+            if vecinos is not None:
+                candidatos = vecinos(coordinada)
+            else:
+                x, y = coordinada
+                candidatos = [n for n in ((x+1,y),(x-1,y),(x,y+1),(x,y-1)) if n in cells_by_coord]
+            for n in candidatos:
+                if not is_blocked(n):
                     yield n
 
         open_heap = []
@@ -194,26 +266,28 @@ class RandomAgent(CellAgent):
             return
         
         freeCell = self.neighbors_without_obstacles()
-        if len(freeCell) == 0:
+        if not freeCell:
             return
-        
+
+        # Mismo generador que usaba CellCollection.select_random_cell
+        random = self.cell.random
+
         # 1) Vecinas sucias
-        dirty_neighbors = freeCell.select(
-            lambda cell: any(isinstance(a, DirtyPatch) and a.dirty for a in cell.agents)
-        )
-        if len(dirty_neighbors) > 0:
-            new_cell = dirty_neighbors.select_random_cell()
+        dirty = self.model.occupancy.dirty
+        dirty_neighbors = [cell for cell in freeCell if dirty[cell.coordinate]]
+        if dirty_neighbors:
+            new_cell = random.choice(dirty_neighbors)
         else:
             # 2) Vecinas limpias no visitadas
-            unvisited_clean = freeCell.select(
-                lambda cell: not any(isinstance(a, DirtyPatch) and a.dirty for a in cell.agents)
-                             and (not hasattr(cell, "coordinate") or cell.coordinate not in self.visited)
-            )
-            if len(unvisited_clean) > 0:
-                new_cell = unvisited_clean.select_random_cell()
+            unvisited_clean = [
+                cell for cell in freeCell
+                if not dirty[cell.coordinate] and cell.coordinate not in self.visited
+            ]
+            if unvisited_clean:
+                new_cell = random.choice(unvisited_clean)
             else:
                 # 3) fallback aleatorio
-                new_cell = freeCell.select_random_cell()
+                new_cell = random.choice(freeCell)
 
         if new_cell is None:
             return
@@ -231,13 +305,10 @@ class RandomAgent(CellAgent):
         """
         Limpia la celda que localiza el agente
         """
-        dirty_patches = [
-            a for a in self.cell.agents
-            if isinstance(a, DirtyPatch) and a.dirty
-        ]
-        if dirty_patches:
-            dirty_patch = dirty_patches[0]
-            dirty_patch.dirty = False
+        dirty = self.model.occupancy.dirty
+        coordinate = self.cell.coordinate
+        if dirty[coordinate]:
+            dirty[coordinate] = False
             self.battery = max(0, self.battery - 1)
             self.model.remaining_dirty_cells = max(0, self.model.remaining_dirty_cells - 1)
             self.model.cleaned_cells += 1
@@ -251,7 +322,7 @@ class RandomAgent(CellAgent):
 
     def step(self):
         # Si la celda está sucia, limpiar
-        if any(isinstance(a, DirtyPatch) and a.dirty for a in self.cell.agents):
+        if self.model.occupancy.is_dirty(self.cell.coordinate):
             if self.battery > 0:
                 self.clean()
             return
@@ -4,6 +4,11 @@ from mesa.discrete_space import OrthogonalMooreGrid # Importa la cuadrícula ort
 
 # Importamos los agentes definidos
 from .agent import RandomAgent, ObstacleAgent, DirtyPatch, ChargingStation
+from .navigation import NavigationMap
+from .occupancy import OccupancyIndex
+from .placement import PLACEMENTS, choose_cells
+
+ROUTING = ("greedy", "astar", "field")
 
 class RandomModel(Model):
     """
@@ -15,10 +20,27 @@ class RandomModel(Model):
     dirty_percent: Porcentaje de celdas sucias al inicio
     obstacle_percent: Porcentaje de celdas con obstáculos al inicio
     max_steps: Número máximo de pasos de la simulación
+    placement: "compatible" elige obstáculos y celdas sucias con la misma
+               secuencia aleatoria que antes (mismos resultados por seed) en
+               O(log n) por celda; "sample" usa un solo random.sample
+    headless: Si es True no se crean DirtyPatch; la suciedad sólo vive en
+              occupancy.dirty y ensure_dirt_patches() los crea para dibujar
+    routing: "greedy" regresa al cargador bajando la distancia Manhattan (original);
+             "astar" sigue rutas A* sobre el mapa de obstáculos, guardadas en caché;
+             "field" usa un BFS desde el cargador: need_to_charge compara con
+             los pasos reales y el regreso baja por ese campo
     """
-    def __init__(self, width=10, height=10, dirty_percent=0.4, obstacle_percent=0.1, max_steps=500, seed=None):
+    def __init__(self, width=10, height=10, dirty_percent=0.4, obstacle_percent=0.1, max_steps=500, seed=None, routing="greedy", placement="compatible",
+                 headless=False):
 
         super().__init__(seed=seed)
+        if routing not in ROUTING:
+            raise ValueError(f"routing must be one of {ROUTING}, got {routing!r}")
+        self.routing = routing
+        if placement not in PLACEMENTS:
+            raise ValueError(f"placement must be one of {PLACEMENTS}, got {placement!r}")
+        self.placement = placement
+        self.headless = headless
         self.width = width
         self.height = height
         self.dirty_percent = dirty_percent
@@ -27,6 +49,8 @@ class RandomModel(Model):
 
         # Crea el grid sin torus
         self.grid = OrthogonalMooreGrid([width, height], torus=False)
+        # Capas por tipo de ocupante; los agentes la actualizan al crearse y moverse
+        self.occupancy = OccupancyIndex(width, height)
 
         # Métricas del modelo
         self.actual_step = 0
@@ -54,38 +78,32 @@ class RandomModel(Model):
         num_obstacles = int(total_cells * obstacle_percent)
         num_obstacles = min(num_obstacles, len(cells_without_charger))
 
-        obstacle_cells = []
-        available_cells = list(cells_without_charger)
-        for _ in range(num_obstacles):
-            if not available_cells:
-                break
-            cell = self.random.choice(available_cells)
-            obstacle_cells.append(cell)
-            available_cells.remove(cell)
+        obstacle_cells = choose_cells(self.random, cells_without_charger, num_obstacles, placement)
         for cell in obstacle_cells:
             ObstacleAgent(self, cell = cell)
 
+        # Los obstáculos ya no cambian: vecinos caminables precalculados por celda
+        self.navigation = NavigationMap(self.grid, self.occupancy.obstacle, self.occupancy.charger)
+
         # Crear celdas sucias en la cuadrícula
         free_for_dirty = [
             cell for cell in self.grid.all_cells
             if (cell is not charger_cell)
-            and not any(isinstance(a, ObstacleAgent) for a in cell.agents)
+            and not self.occupancy.obstacle[cell.coordinate]
         ]
 
         num_dirty = int(total_cells * dirty_percent)
         num_dirty = min(num_dirty, len(free_for_dirty))
 
-        dirty_cells = []
-        available_dirty_cells = list(free_for_dirty)
-        for _ in range(num_dirty):
-            if not available_dirty_cells:
-                break
-            cell = self.random.choice(available_dirty_cells)
-            dirty_cells.append(cell)
-            available_dirty_cells.remove(cell)
+        dirty_cells = choose_cells(self.random, free_for_dirty, num_dirty, placement)
         
+        # La suciedad vive en occupancy.dirty; los DirtyPatch son sólo para dibujar
         for cell in dirty_cells:
-            DirtyPatch(self, cell = cell, dirty = True)
+            if headless:
+                self.occupancy.dirty[cell.coordinate] = True
+            else:
+                DirtyPatch(self, cell = cell, dirty = True)
+        self.dirt_patches_built = not headless
 
         # Total de celdas en la cuadrícula
         self.total_floor_cells = total_cells - num_obstacles
@@ -113,6 +131,18 @@ class RandomModel(Model):
         self.running = True
         self.datacollector.collect(self)
 
+    def ensure_dirt_patches(self):
+        """
+        Crea los DirtyPatch de las celdas que siguen sucias la primera vez que
+        un visor los necesita (sólo hace algo con headless=True)
+        """
+        if self.dirt_patches_built:
+            return
+        for cell in self.grid.all_cells:
+            if self.occupancy.dirty[cell.coordinate]:
+                DirtyPatch(self, cell = cell, dirty = True)
+        self.dirt_patches_built = True
+
     def step(self):
         """
         Avanza un paso en la simulación
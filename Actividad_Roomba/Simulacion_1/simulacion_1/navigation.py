@@ -0,0 +1,148 @@
+import numpy as np
+
+# Distancia de las celdas que no pueden llegar a ningún cargador
+UNREACHABLE = np.iinfo(np.int32).max
+
+# Desplazamientos del vecindario de Moore en el orden en que
+# OrthogonalMooreGrid conecta las celdas (el orden de cell.neighborhood)
+MOORE_OFFSETS = np.array([
+    (-1, -1), (-1, 0), (-1, 1),
+    ( 0, -1),          ( 0, 1),
+    ( 1, -1), ( 1, 0), ( 1, 1),
+])
+
+class NavigationMap:
+    """
+    Mapa estático de navegación, calculado una vez al construir el modelo
+    (los obstáculos y cargadores no se mueven después de __init__).
+
+    Las celdas se numeran con un índice plano: index = x * height + y, el
+    mismo orden que grid.all_cells.
+
+    walkable: Máscara (width, height), True si la celda no tiene obstáculo
+    neighbor_offsets, neighbor_index: Tabla de vecinos caminables en formato
+        CSR (int32). Los vecinos de la celda i son
+        neighbor_index[neighbor_offsets[i]:neighbor_offsets[i + 1]], en el
+        mismo orden que cell.neighborhood.
+    cells: Lista de Cell por índice plano
+    next_hop: Caché de rutas A*, {(coordenada, destino): siguiente coordenada}
+        (None si ya llegó o no hay ruta). Se vacía cuando cambian los obstáculos.
+    charger_distance(): Pasos reales (BFS desde todos los cargadores a la vez)
+        hasta el cargador más cercano. Se calcula al primer uso y otra vez sólo
+        si cambian los obstáculos o los cargadores.
+    """
+    def __init__(self, grid, obstacle, charger=None):
+        """
+        args:
+            grid: OrthogonalMooreGrid del modelo
+            obstacle: Capa obstacle del OccupancyIndex (width, height)
+            charger: Capa charger del OccupancyIndex (para charger_distance)
+        """
+        self.width, self.height = obstacle.shape
+        self.obstacle = obstacle
+        self.charger = charger
+        self._charger_field = None
+        self.cells = list(grid.all_cells)
+        self.cells_by_coord = {cell.coordinate: cell for cell in self.cells}
+        self.next_hop = {}
+        # Vecinos de la retícula completa (celdas, 8): la cuadrícula es regular,
+        # así que no hace falta recorrer cell.neighborhood
+        x, y = np.divmod(np.arange(self.width * self.height), self.height)
+        neighbor_x = x[:, None] + MOORE_OFFSETS[:, 0]
+        neighbor_y = y[:, None] + MOORE_OFFSETS[:, 1]
+        self._in_grid = (
+            (neighbor_x >= 0) & (neighbor_x < self.width)
+            & (neighbor_y >= 0) & (neighbor_y < self.height)
+        )
+        self._lattice = np.where(self._in_grid, neighbor_x * self.height + neighbor_y, 0)
+        self.rebuild()
+
+    def rebuild(self):
+        """
+        Recalcula la máscara y la tabla de vecinos, y descarta las rutas guardadas
+        """
+        self.walkable = ~self.obstacle
+        keep = self._in_grid & self.walkable.reshape(-1)[self._lattice]
+        offsets = np.zeros(len(self.cells) + 1, dtype=np.int32)
+        np.cumsum(keep.sum(axis=1), out=offsets[1:])
+        self.neighbor_offsets = offsets
+        # Recorrer keep por filas conserva el orden de vecinos de cada celda
+        self.neighbor_index = self._lattice[keep].astype(np.int32)
+        self.next_hop.clear()
+        self._charger_field = None
+
+    def set_obstacle(self, coordinate, blocked=True):
+        """
+        Cambia el mapa de obstáculos después de construir el modelo
+        (la tabla se rehace con NumPy, O(celdas) sin ciclos de Python)
+        """
+        self.obstacle[coordinate] = blocked
+        self.rebuild()
+
+    def chargers_changed(self):
+        """
+        Descarta el campo de distancias para recalcularlo con los cargadores actuales
+        """
+        self._charger_field = None
+
+    def distance_field(self, sources):
+        """
+        BFS desde varias fuentes (índices planos) sobre la tabla de vecinos.
+        Regresa un arreglo (width, height) int32 con los pasos hasta la fuente
+        más cercana (UNREACHABLE si no hay camino). Cada nivel del BFS se
+        expande completo con operaciones de NumPy.
+        """
+        offsets, table = self.neighbor_offsets, self.neighbor_index
+        distance = np.full(len(self.cells), UNREACHABLE, dtype=np.int32)
+        frontier = np.unique(np.asarray(sources, dtype=np.int32))
+        distance[frontier] = 0
+        level = 0
+        while frontier.size:
+            level += 1
+            starts = offsets[frontier]
+            counts = offsets[frontier + 1] - starts
+            # Posiciones en table de todos los vecinos de la frontera
+            positions = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+            reached = table[positions]
+            frontier = np.unique(reached[distance[reached] == UNREACHABLE])
+            distance[frontier] = level
+        return distance.reshape(self.width, self.height)
+
+    def charger_distance(self, coordinate):
+        """
+        Pasos hasta el cargador más cercano desde la coordenada
+        """
+        if self._charger_field is None:
+            self._charger_field = self.distance_field(np.flatnonzero(self.charger.reshape(-1)))
+        return int(self._charger_field[coordinate])
+
+    def index(self, coordinate):
+        """
+        Índice plano de una coordenada (x, y)
+        """
+        return coordinate[0] * self.height + coordinate[1]
+
+    def walkable_neighbors(self, coordinate):
+        """
+        Índices planos de los vecinos sin obstáculo de la coordenada
+        """
+        i = self.index(coordinate)
+        return self.neighbor_index[self.neighbor_offsets[i]:self.neighbor_offsets[i + 1]].tolist()
+
+    def walkable_neighbor_coords(self, coordinate):
+        """
+        Coordenadas de los vecinos sin obstáculo (vecindario de Moore)
+        """
+        return [self.cells[i].coordinate for i in self.walkable_neighbors(coordinate)]
+
+    def is_blocked(self, coordinate):
+        return not self.walkable[coordinate]
+
+    def store_path(self, path, goal):
+        """
+        Guarda en next_hop cada paso de una ruta hacia goal; como cada sufijo
+        de una ruta óptima también es óptimo, sirve desde cualquier punto de ella
+        """
+        for current, following in zip(path, path[1:]):
+            self.next_hop[(current, goal)] = following
+        self.next_hop[(goal, goal)] = None
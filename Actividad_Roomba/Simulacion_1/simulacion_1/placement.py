@@ -0,0 +1,72 @@
+"""
+Elección de celdas al construir RandomModel (obstáculos, inicios, suciedad)
+
+El constructor original hacía k veces random.choice(disponibles) seguido de
+disponibles.remove(celda), que es O(n) por elección. Aquí hay dos modos:
+
+"compatible": Mismos números aleatorios y mismo resultado que ese ciclo,
+    pero la r-ésima celda que queda se busca en un árbol de Fenwick, así que
+    cada elección es O(log n).
+"sample": Un solo random.sample sobre los candidatos. Es el más rápido, pero
+    consume otra secuencia de números aleatorios (resultados distintos para
+    la misma seed).
+"""
+
+PLACEMENTS = ("compatible", "sample")
+
+
+class RemainingIndex:
+    """
+    Árbol de Fenwick sobre n posiciones que empiezan todas disponibles.
+    Encuentra la r-ésima posición disponible y la quita en O(log n).
+    """
+    def __init__(self, n):
+        self.n = n
+        # Construcción lineal de un Fenwick con todas las cuentas en 1
+        tree = [0] + [1] * n
+        for i in range(1, n + 1):
+            parent = i + (i & -i)
+            if parent <= n:
+                tree[parent] += tree[i]
+        self.tree = tree
+        self.top_bit = 1 << (n.bit_length() - 1) if n else 0
+
+    def pop(self, r):
+        """
+        Quita y regresa la posición (base 0) de la r-ésima disponible (base 0)
+        """
+        tree = self.tree
+        position = 0
+        step = self.top_bit
+        remaining = r + 1
+        while step:
+            following = position + step
+            if following <= self.n and tree[following] < remaining:
+                position = following
+                remaining -= tree[following]
+            step >>= 1
+        # position + 1 es el índice (base 1) encontrado; se descuenta del árbol
+        i = position + 1
+        while i <= self.n:
+            tree[i] -= 1
+            i += i & -i
+        return position
+
+
+def choose_cells(rng, candidates, k, placement="compatible"):
+    """
+    Elige k celdas distintas de candidates (lista) con el generador rng
+    """
+    if placement not in PLACEMENTS:
+        raise ValueError(f"placement must be one of {PLACEMENTS}, got {placement!r}")
+    k = min(k, len(candidates))
+    if placement == "sample":
+        return rng.sample(candidates, k)
+
+    index = RemainingIndex(len(candidates))
+    chosen = []
+    for remaining in range(len(candidates), len(candidates) - k, -1):
+        # rng.choice sobre un range consume lo mismo que sobre la lista original
+        r = rng.choice(range(remaining))
+        chosen.append(candidates[index.pop(r)])
+    return chosen
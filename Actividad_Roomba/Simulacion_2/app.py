@@ -70,6 +70,8 @@ model_params = {
     "dirty_percent": Slider("Dirty %", 0.4, 0.0, 1.0, 0.05),
     "obstacle_percent": Slider("Obstacle %", 0.1, 0.0, 0.5, 0.05),
     "max_steps": Slider("Max Steps", 500, 50, 50000, 50),
+    # La suciedad vive en un arreglo; los DirtyPatch se crean sólo para dibujar
+    "headless": True,
 }
 
 # Función para crear una instancia del modelo
@@ -81,15 +83,21 @@ model = RandomModel(
     obstacle_percent=model_params["obstacle_percent"].value,
     max_steps=model_params["max_steps"].value,
     seed=model_params["seed"]["value"],
+    headless=model_params["headless"],
 )
 
 # Componente de visualización del espacio
-space_component = make_space_component(
+grid_component = make_space_component(
         random_portrayal,
         draw_grid = False,
         post_process=post_process_space,
 )
 
+def space_component(model):
+    # Con headless=True los DirtyPatch se crean la primera vez que se dibuja
+    model.ensure_dirt_patches()
+    return grid_component(model)
+
 def plot_componentBattery(model):
     import matplotlib.pyplot as plt # Importar matplotlib
     
@@ -0,0 +1,147 @@
+"""
+Registro de métricas en columnas de NumPy (alternativa ligera a DataCollector)
+
+DataCollector evalúa 2 * num_agents + 5 lambdas por paso y sus reporters de
+agente corren sobre todos los agentes (también DirtyPatch, ObstacleAgent y
+ChargingStation, que sólo regresan None). MetricsRecorder sólo lee
+model.cleaners y escribe en arreglos de ancho fijo, preasignados, que
+duplican su capacidad cuando se llenan.
+"""
+import numpy as np
+
+# Columnas del modelo (mismos nombres que los model_reporters de RandomModel)
+MODEL_COLUMNS = {
+    "Step": np.int64,
+    "Remaining Dirty Cells": np.int64,
+    "CleanPercent": np.float64,
+    "Movements": np.int64,
+    "AvgBattery": np.float64,
+}
+# Columnas por RandomAgent (mismos nombres que los agent_reporters)
+AGENT_COLUMNS = {
+    "Battery": np.int16,
+    "Movements": np.int64,
+    "CleanedCells": np.int64,
+}
+
+class MetricsRecorder:
+    """
+    Guarda una fila cada interval pasos (y siempre el paso en que el modelo
+    se detiene). Tiene la misma interfaz que DataCollector que usa la app:
+    collect(model), get_model_vars_dataframe() y get_agent_vars_dataframe().
+    """
+    def __init__(self, num_agents, interval=1, capacity=64):
+        """
+        args:
+            num_agents: Número de RandomAgent (columnas por agente)
+            interval: Cada cuántos pasos se registra
+            capacity: Filas preasignadas al inicio
+        """
+        if interval < 1:
+            raise ValueError(f"interval must be >= 1, got {interval}")
+        self.num_agents = num_agents
+        self.interval = interval
+        self.rows = 0
+        self.capacity = max(1, capacity)
+        self.model_vars = {
+            name: np.zeros(self.capacity, dtype=dtype) for name, dtype in MODEL_COLUMNS.items()
+        }
+        self.agent_vars = {
+            name: np.zeros((self.capacity, num_agents), dtype=dtype) for name, dtype in AGENT_COLUMNS.items()
+        }
+        self.agent_ids = None
+
+    def _grow(self):
+        """
+        Duplica la capacidad de todos los buffers
+        """
+        self.capacity *= 2
+        for columns in (self.model_vars, self.agent_vars):
+            for name, buffer in columns.items():
+                grown = np.zeros((self.capacity,) + buffer.shape[1:], dtype=buffer.dtype)
+                grown[:self.rows] = buffer[:self.rows]
+                columns[name] = grown
+
+    def collect(self, model):
+        """
+        Registra el estado actual si toca en este paso
+        """
+        if model.actual_step % self.interval and model.running:
+            return
+        cleaners = model.cleaners
+        if self.agent_ids is None:
+            self.agent_ids = np.array([a.unique_id for a in cleaners], dtype=np.int64)
+        battery = np.fromiter((a.battery for a in cleaners), dtype=np.int16, count=len(cleaners))
+        movements = np.fromiter((a.move_count for a in cleaners), dtype=np.int64, count=len(cleaners))
+        cleaned = np.fromiter((a.cleaned_cells for a in cleaners), dtype=np.int64, count=len(cleaners))
+        initial = model.initial_dirty_cells
+        self.record(
+            step=model.actual_step,
+            remaining_dirty_cells=model.remaining_dirty_cells,
+            clean_percent=0.0 if initial == 0 else 100.0 * (initial - model.remaining_dirty_cells) / initial,
+            movements=model.move_count,
+            battery=battery,
+            move_count=movements,
+            cleaned_cells=cleaned,
+        )
+
+    def record(self, step, remaining_dirty_cells, clean_percent, movements, battery, move_count, cleaned_cells):
+        """
+        Agrega una fila con valores ya calculados (battery, move_count y
+        cleaned_cells son arreglos de largo num_agents)
+        """
+        if self.rows == self.capacity:
+            self._grow()
+        row = self.rows
+        model_vars, agent_vars = self.model_vars, self.agent_vars
+        model_vars["Step"][row] = step
+        model_vars["Remaining Dirty Cells"][row] = remaining_dirty_cells
+        model_vars["CleanPercent"][row] = clean_percent
+        model_vars["Movements"][row] = movements
+        model_vars["AvgBattery"][row] = battery.mean() if len(battery) else 0.0
+        agent_vars["Battery"][row] = battery
+        agent_vars["Movements"][row] = move_count
+        agent_vars["CleanedCells"][row] = cleaned_cells
+        self.rows += 1
+
+    def model_column(self, name):
+        """
+        Vista (sin copiar) de las filas registradas de una columna del modelo
+        """
+        return self.model_vars[name][:self.rows]
+
+    def agent_column(self, name):
+        """
+        Vista (filas, num_agents) de una columna por agente
+        """
+        return self.agent_vars[name][:self.rows]
+
+    def get_model_vars_dataframe(self):
+        """
+        Mismas columnas que el DataFrame de DataCollector (con Battery_i y
+        Movement_i por agente); el índice es el Step de cada fila
+        """
+        import pandas as pd
+
+        data = {name: self.model_column(name) for name in MODEL_COLUMNS}
+        for i in range(self.num_agents):
+            data[f"Battery_{i}"] = self.agent_column("Battery")[:, i]
+        for i in range(self.num_agents):
+            data[f"Movement_{i}"] = self.agent_column("Movements")[:, i]
+        return pd.DataFrame(data, index=self.model_column("Step"))
+
+    def get_agent_vars_dataframe(self):
+        """
+        Una fila por (Step, AgentID), como DataCollector pero sólo con RandomAgent
+        """
+        import pandas as pd
+
+        ids = self.agent_ids if self.agent_ids is not None else np.arange(self.num_agents)
+        index = pd.MultiIndex.from_arrays(
+            [np.repeat(self.model_column("Step"), self.num_agents), np.tile(ids, self.rows)],
+            names=["Step", "AgentID"],
+        )
+        return pd.DataFrame(
+            {name: self.agent_column(name).reshape(-1) for name in AGENT_COLUMNS},
+            index=index,
+        )
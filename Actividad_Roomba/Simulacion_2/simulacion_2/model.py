@@ -1,8 +1,17 @@
+from time import perf_counter
+
 from mesa import Model
 from mesa.datacollection import DataCollector # DataCollector para recolectar los stats del modelo
 from mesa.discrete_space import OrthogonalMooreGrid
 
 from .agent import RandomAgent, ObstacleAgent, DirtyPatch, ChargingStation
+from .metrics import MetricsRecorder
+from .navigation import NavigationMap
+from .occupancy import OccupancyIndex
+from .placement import PLACEMENTS, choose_cells
+from .profiling import PhaseProfiler
+
+ROUTING = ("greedy", "astar", "field")
 
 class RandomModel(Model):
     """
@@ -15,10 +24,35 @@ class RandomModel(Model):
     dirty_percent: Porcentaje de celdas sucias al inicio
     obstacle_percent: Porcentaje de celdas con obstáculos al inicio
     max_steps: Número máximo de pasos de la simulación
+    placement: "compatible" elige obstáculos y celdas sucias con la misma
+               secuencia aleatoria que antes (mismos resultados por seed) en
+               O(log n) por celda; "sample" usa un solo random.sample
+    headless: Si es True no se crean DirtyPatch; la suciedad sólo vive en
+              occupancy.dirty y ensure_dirt_patches() los crea para dibujar
+    routing: "greedy" regresa al cargador bajando la distancia Manhattan (original);
+             "astar" sigue rutas A* sobre el mapa de obstáculos, guardadas en caché;
+             "field" usa un BFS desde todos los cargadores: need_to_charge compara
+             con los pasos reales al más cercano y el regreso baja por ese campo
+    metrics_interval: Si se da (entero >= 1), self.datacollector es un
+                      MetricsRecorder (arreglos de NumPy, sólo RandomAgent)
+                      que registra cada metrics_interval pasos
+    profile: Si es True, self.profiler (PhaseProfiler) acumula el tiempo de
+             cada fase de step y de cada decisión de los agentes
     """
-    def __init__(self, width=10, height=10, num_agents=3, dirty_percent=0.4, obstacle_percent=0.1, max_steps=500, seed=None):
+    def __init__(self, width=10, height=10, num_agents=3, dirty_percent=0.4, obstacle_percent=0.1, max_steps=500, seed=None,
+                 profile=False, routing="greedy", placement="compatible", headless=False,
+                 metrics_interval=None):
 
         super().__init__(seed=seed)
+        if routing not in ROUTING:
+            raise ValueError(f"routing must be one of {ROUTING}, got {routing!r}")
+        self.routing = routing
+        if placement not in PLACEMENTS:
+            raise ValueError(f"placement must be one of {PLACEMENTS}, got {placement!r}")
+        self.placement = placement
+        self.headless = headless
+        # None cuando no se perfila: step sólo revisa esta referencia
+        self.profiler = PhaseProfiler() if profile else None
         self.width = width
         self.height = height
         self.num_agents = num_agents
@@ -28,6 +62,8 @@ class RandomModel(Model):
 
         # Crea el grid sin torus
         self.grid = OrthogonalMooreGrid([width, height], torus=False)
+        # Capas por tipo de ocupante; los agentes la actualizan al crearse y moverse
+        self.occupancy = OccupancyIndex(width, height)
 
         # Métricas del modelo
         self.actual_step = 0
@@ -42,63 +78,47 @@ class RandomModel(Model):
         num_obstacles = int(total_cells * obstacle_percent)
         num_obstacles = min(num_obstacles, len(all_cells))
 
-        obstacle_cells = []
-        available_cells = list(all_cells)
-        for _ in range(num_obstacles):
-            if not available_cells:
-                break
-            cell = self.random.choice(available_cells)
-            obstacle_cells.append(cell)
-            available_cells.remove(cell)
+        obstacle_cells = choose_cells(self.random, all_cells, num_obstacles, placement)
         
         for cell in obstacle_cells:
             ObstacleAgent(self, cell = cell)
 
+        # Los obstáculos ya no cambian: vecinos caminables precalculados por celda
+        self.navigation = NavigationMap(self.grid, self.occupancy.obstacle, self.occupancy.charger)
+
         # Crear posiciones iniciales de los agentes aspiradora
         free_for_agents = [
             cell for cell in self.grid.all_cells
-            if not any(isinstance(a, ObstacleAgent) for a in cell.agents)
+            if not self.occupancy.obstacle[cell.coordinate]
         ]
         num_agents_to_create = min(num_agents, len(free_for_agents))
-        agent_start_cells = []
-        available_for_start = list(free_for_agents)
-
-        for _ in range(num_agents_to_create):
-            if not available_for_start:
-                break
-            cell = self.random.choice(available_for_start)
-            agent_start_cells.append(cell)
-            available_for_start.remove(cell)
+        agent_start_cells = choose_cells(self.random, free_for_agents, num_agents_to_create, placement)
 
         # Crear estaciones de recarga en la posición de los agentes
         self.chargers = []
-        charger_positions = []
         for cell in agent_start_cells:
             charger = ChargingStation(self, cell=cell)
             self.chargers.append(charger)
-            charger_positions.append(cell.coordinate)
 
         # Crear celdas sucias en la cuadrícula
         free_for_dirty = [
             cell for cell in self.grid.all_cells
-            if not any(isinstance(a, ObstacleAgent) for a in cell.agents)
-            and cell.coordinate not in charger_positions
+            if not self.occupancy.obstacle[cell.coordinate]
+            and not self.occupancy.charger[cell.coordinate]
         ]
 
         num_dirty = int(total_cells * dirty_percent)
         num_dirty = min(num_dirty, len(free_for_dirty))
 
-        dirty_cells = []
-        available_dirty_cells = list(free_for_dirty)
-        for _ in range(num_dirty):
-            if not available_dirty_cells:
-                break
-            cell = self.random.choice(available_dirty_cells)
-            dirty_cells.append(cell)
-            available_dirty_cells.remove(cell)
+        dirty_cells = choose_cells(self.random, free_for_dirty, num_dirty, placement)
         
+        # La suciedad vive en occupancy.dirty; los DirtyPatch son sólo para dibujar
         for cell in dirty_cells:
-            DirtyPatch(self, cell = cell, dirty = True)
+            if headless:
+                self.occupancy.dirty[cell.coordinate] = True
+            else:
+                DirtyPatch(self, cell = cell, dirty = True)
+        self.dirt_patches_built = not headless
 
         # Total de celdas en la cuadrícula
         self.total_floor_cells = total_cells - num_obstacles
@@ -119,6 +139,20 @@ class RandomModel(Model):
                 )
             )
 
+        self.running = True
+
+        if metrics_interval is not None:
+            # Misma interfaz que DataCollector (collect y los DataFrames)
+            self.datacollector = MetricsRecorder(len(self.cleaners), interval=metrics_interval)
+        else:
+            self.datacollector = self._build_datacollector()
+
+        self.datacollector.collect(self)
+
+    def _build_datacollector(self):
+        """
+        DataCollector con los reporters de siempre (metrics_interval=None)
+        """
         # Recolección de datos del agente para la estadística
         model_reporters = {
             "Step": lambda m: m.actual_step,
@@ -144,7 +178,7 @@ class RandomModel(Model):
                 m.cleaners[idx].move_count if idx < len(m.cleaners) else 0
             )
         
-        self.datacollector = DataCollector(
+        return DataCollector(
             model_reporters=model_reporters,
             agent_reporters={
                 "Battery": lambda a: a.battery if isinstance(a, RandomAgent) else None,
@@ -153,8 +187,17 @@ class RandomModel(Model):
             }
         )
 
-        self.running = True
-        self.datacollector.collect(self)
+    def ensure_dirt_patches(self):
+        """
+        Crea los DirtyPatch de las celdas que siguen sucias la primera vez que
+        un visor los necesita (sólo hace algo con headless=True)
+        """
+        if self.dirt_patches_built:
+            return
+        for cell in self.grid.all_cells:
+            if self.occupancy.dirty[cell.coordinate]:
+                DirtyPatch(self, cell = cell, dirty = True)
+        self.dirt_patches_built = True
 
     def step(self):
         """
@@ -163,12 +206,26 @@ class RandomModel(Model):
         if not self.running:
             return
         self.actual_step += 1
+        profiler = self.profiler
+        if profiler is not None:
+            start = perf_counter()
 
         # Los agentes actúan en orden aleatorio cada paso
         agent_order = list(self.cleaners)
         self.random.shuffle(agent_order)
-        for agent in agent_order:
-            agent.step()
+
+        if profiler is None:
+            for agent in agent_order:
+                agent.step()
+        else:
+            profiler.add("ordering", perf_counter() - start)
+            phase_start = perf_counter()
+            for agent in agent_order:
+                start = perf_counter()
+                decision = agent.step()
+                profiler.add(f"agent.{decision}", perf_counter() - start)
+            profiler.add("agent_step", perf_counter() - phase_start)
+            start = perf_counter()
 
         # Si ya no hay celdas sucias, se detiene la simulación
         if self.remaining_dirty_cells == 0 and self.time_to_clean is None:
@@ -178,6 +235,13 @@ class RandomModel(Model):
         # Si se llega al tiempo máximo, se detiene la simulación
         if self.actual_step >= self.max_steps:
             self.running = False
-        
+
+        if profiler is not None:
+            profiler.add("termination", perf_counter() - start)
+            start = perf_counter()
+
         # Recolecta los datos del modelo
-        self.datacollector.collect(self)
\ No newline at end of file
+        self.datacollector.collect(self)
+
+        if profiler is not None:
+            profiler.add("datacollector", perf_counter() - start)
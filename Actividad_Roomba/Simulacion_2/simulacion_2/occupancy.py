@@ -0,0 +1,42 @@
+import numpy as np
+
+class OccupancyIndex:
+    """
+    Índice de ocupación por celda: una capa densa (width, height) por tipo de
+    ocupante, para consultar en O(1) lo que antes se buscaba con
+    any(isinstance(a, X) for a in cell.agents).
+
+    Capas:
+    obstacle: True si hay un ObstacleAgent
+    charger: True si hay una ChargingStation
+    dirty: True si la celda está sucia. Es la fuente de verdad: RandomAgent la
+        lee y limpia directamente y DirtyPatch.dirty sólo es una vista sobre ella
+    robots: Número de RandomAgent en la celda
+
+    Los agentes la mantienen al día: ObstacleAgent y ChargingStation se
+    registran al crearse, y RandomAgent al crearse y en movement.
+    """
+    def __init__(self, width, height):
+        self.obstacle = np.zeros((width, height), dtype=bool)
+        self.charger = np.zeros((width, height), dtype=bool)
+        self.dirty = np.zeros((width, height), dtype=bool)
+        self.robots = np.zeros((width, height), dtype=np.int16)
+
+    def move_robot(self, old, new):
+        """
+        Mueve un robot de la coordenada old a new
+        """
+        self.robots[old] -= 1
+        self.robots[new] += 1
+
+    def is_obstacle(self, coordinate):
+        return bool(self.obstacle[coordinate])
+
+    def is_charger(self, coordinate):
+        return bool(self.charger[coordinate])
+
+    def is_dirty(self, coordinate):
+        return bool(self.dirty[coordinate])
+
+    def has_robot(self, coordinate):
+        return self.robots[coordinate] > 0
@@ -0,0 +1,46 @@
+"""
+Tiempos acumulados por fase de RandomModel.step (sólo si profile=True)
+"""
+from collections import defaultdict
+
+
+class PhaseProfiler:
+    """
+    Acumula tiempo de reloj (segundos) y número de llamadas por fase.
+
+    Fases del modelo: "ordering", "agent_step", "termination", "datacollector".
+    Decisiones del agente: "agent.clean", "agent.charge",
+    "agent.move_to_charger", "agent.explore", "agent.idle".
+    """
+    def __init__(self):
+        self.total_time = defaultdict(float)
+        self.calls = defaultdict(int)
+
+    def add(self, phase, seconds):
+        self.total_time[phase] += seconds
+        self.calls[phase] += 1
+
+    def reset(self):
+        self.total_time.clear()
+        self.calls.clear()
+
+    def as_dict(self):
+        """
+        {fase: {"calls", "total_s", "mean_s"}}
+        """
+        return {
+            phase: {
+                "calls": self.calls[phase],
+                "total_s": total,
+                "mean_s": total / self.calls[phase],
+            }
+            for phase, total in self.total_time.items()
+        }
+
+    def to_dataframe(self):
+        """
+        Lo mismo que as_dict, como DataFrame con una fila por fase
+        """
+        import pandas as pd
+
+        return pd.DataFrame.from_dict(self.as_dict(), orient="index").rename_axis("phase")
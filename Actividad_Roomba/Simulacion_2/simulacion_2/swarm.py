@@ -0,0 +1,287 @@
+"""
+Motor headless para flotas grandes de aspiradoras (cientos de robots)
+
+RandomModel.step llama a RandomAgent.step uno por uno. SwarmEngine guarda
+posiciones, baterías y modos de todos los robots en arreglos de NumPy y
+resuelve cada paso con operaciones por lotes. Las reglas son las de
+RandomAgent.step:
+
+1) Celda sucia: limpiar (si tiene batería)
+2) Necesita recargar y no está en un cargador: bajar hacia el cargador
+3) En un cargador con batería < 100: recargar +5
+4) Si tiene batería: explorar (vecina sucia, si no limpia no visitada,
+   si no cualquiera libre)
+
+Conflictos: todos los robots deciden viendo el tablero del inicio del paso.
+Si varios eligen la misma celda, gana el de menor prioridad (una permutación
+aleatoria por paso, como el shuffle del modelo); los demás vuelven a elegir
+sin esa celda, en rondas, hasta que nadie choca. Una celda que otro robot
+deja libre en este paso se puede ocupar hasta el siguiente. Con la misma
+seed el resultado es siempre el mismo, pero no la misma trayectoria que el
+modelo de agentes (los números aleatorios se consumen distinto).
+"""
+import numpy as np
+
+from .model import RandomModel
+
+# Índices de self.mode; los nombres son los que regresa RandomAgent.step
+MODES = ("idle", "clean", "move_to_charger", "charge", "explore")
+IDLE, CLEAN, RETURN, CHARGE, EXPLORE = range(len(MODES))
+
+class SwarmEngine:
+    """
+    Copia el estado inicial de un RandomModel y lo simula con arreglos.
+
+    Las celdas usan el índice plano de NavigationMap (x * height + y).
+    Estado por robot (arreglos de largo num_robots):
+    position: Celda actual
+    battery: Batería (0-100)
+    mode: Decisión del último paso (índice en MODES)
+    main_charger: Celda de su estación principal
+    move_count, cleaned_cells: Métricas por robot
+    visited: Celdas visitadas, un bit por celda (num_robots, ceil(celdas / 8))
+    """
+    def __init__(self, model):
+        """
+        args:
+            model: RandomModel recién construido (de preferencia con
+                   headless=True); sólo se lee, el motor no lo modifica.
+                   Sus routing "greedy" y "field" están soportados
+        """
+        if model.routing not in ("greedy", "field"):
+            raise ValueError(f"SwarmEngine supports routing 'greedy' or 'field', got {model.routing!r}")
+        navigation = model.navigation
+        self.routing = model.routing
+        self.width, self.height = model.width, model.height
+        self.max_steps = model.max_steps
+        # Mismo generador de NumPy que el modelo, ya sembrado con su seed
+        self.rng = model.rng
+
+        cells = self.width * self.height
+        self.dirty = model.occupancy.dirty.reshape(-1).copy()
+        self.charger = model.occupancy.charger.reshape(-1).copy()
+        self.robots = model.occupancy.robots.reshape(-1).astype(np.int32)
+
+        # Tabla de vecinos densa (celdas, 8) con -1 de relleno, mismo orden que el CSR
+        offsets = navigation.neighbor_offsets
+        counts = np.diff(offsets)
+        self.neighbors = np.full((cells, 8), -1, dtype=np.int64)
+        rows = np.repeat(np.arange(cells), counts)
+        columns = np.arange(offsets[-1]) - np.repeat(offsets[:-1], counts)
+        self.neighbors[rows, columns] = navigation.neighbor_index
+
+        if self.routing == "field":
+            field = navigation.distance_field(np.flatnonzero(self.charger))
+            self.field = field.reshape(-1).astype(np.int64)
+        else:
+            self.field = None
+
+        cleaners = model.cleaners
+        self.num_robots = len(cleaners)
+        self.position = np.array([navigation.index(a.cell.coordinate) for a in cleaners], dtype=np.int64)
+        self.main_charger = np.array(
+            [navigation.index(a.get_my_charger_location()) for a in cleaners], dtype=np.int64
+        )
+        self.battery = np.array([a.battery for a in cleaners], dtype=np.int64)
+        self.mode = np.full(self.num_robots, IDLE, dtype=np.int8)
+        self.move_count = np.zeros(self.num_robots, dtype=np.int64)
+        self.cleaned_cells = np.zeros(self.num_robots, dtype=np.int64)
+        self.visited = np.zeros((self.num_robots, (cells + 7) // 8), dtype=np.uint8)
+        self._mark_visited(np.arange(self.num_robots), self.position)
+
+        # Métricas del modelo
+        self.actual_step = model.actual_step
+        self.move_count_total = model.move_count
+        self.remaining_dirty_cells = model.remaining_dirty_cells
+        self.initial_dirty_cells = model.initial_dirty_cells
+        self.total_cleaned_cells = model.cleaned_cells
+        self.time_to_clean = model.time_to_clean
+        self.running = model.running
+
+    @classmethod
+    def from_params(cls, **kwargs):
+        """
+        Construye RandomModel(headless=True, **kwargs) y el motor sobre él
+        """
+        return cls(RandomModel(headless=True, **kwargs))
+
+    def _mark_visited(self, robots, cells):
+        self.visited[robots, cells >> 3] |= (1 << (cells & 7)).astype(np.uint8)
+
+    def _was_visited(self, robots, cells):
+        return (self.visited[robots, cells >> 3] >> (cells & 7)) & 1 == 1
+
+    def distance_to_charger(self, robots, cells):
+        """
+        Distancia Manhattan a la estación principal de cada robot o, con
+        routing="field", pasos reales al cargador más cercano
+        (como RandomAgent.distance_to_charger). cells puede ser (n,) o (n, k)
+        """
+        if self.field is not None:
+            return self.field[cells]
+        charger = self.main_charger[robots]
+        if cells.ndim == 2:
+            charger = charger[:, None]
+        return (
+            np.abs(cells // self.height - charger // self.height)
+            + np.abs(cells % self.height - charger % self.height)
+        )
+
+    def step(self):
+        """
+        Avanza un paso a todos los robots
+        """
+        if not self.running:
+            return
+        self.actual_step += 1
+        everyone = np.arange(self.num_robots)
+        position, battery = self.position, self.battery
+
+        # Decisiones con el estado del inicio del paso (mismo orden que RandomAgent.step)
+        on_dirty = self.dirty[position]
+        at_charger = self.charger[position]
+        distance = self.distance_to_charger(everyone, position)
+        need = (battery <= 10) | (battery <= distance + 5)
+        alive = battery > 0
+        returning = ~on_dirty & need & ~at_charger
+        charging = ~on_dirty & ~returning & at_charger & (battery < 100)
+        exploring = ~on_dirty & ~returning & ~charging & alive
+
+        mode = np.full(self.num_robots, IDLE, dtype=np.int8)
+        mode[on_dirty & alive] = CLEAN
+        mode[returning & alive] = RETURN
+        mode[charging] = CHARGE
+        mode[exploring] = EXPLORE
+        self.mode = mode
+
+        # 1) Limpiar: cada robot está en una celda distinta, no hay conflictos
+        cleaners = np.flatnonzero(mode == CLEAN)
+        self.dirty[position[cleaners]] = False
+        battery[cleaners] -= 1
+        self.cleaned_cells[cleaners] += 1
+        self.total_cleaned_cells += cleaners.size
+        self.remaining_dirty_cells = max(0, self.remaining_dirty_cells - cleaners.size)
+
+        # 3) Recargar
+        chargers = mode == CHARGE
+        battery[chargers] = np.minimum(100, battery[chargers] + 5)
+
+        # 2) y 4) Moverse
+        movers = np.flatnonzero((mode == RETURN) | (mode == EXPLORE))
+        if movers.size:
+            self._move(movers, distance)
+
+        # Misma terminación que RandomModel.step
+        if self.remaining_dirty_cells == 0 and self.time_to_clean is None:
+            self.time_to_clean = self.actual_step
+            self.running = False
+        if self.actual_step >= self.max_steps:
+            self.running = False
+
+    def _move(self, movers, distance):
+        """
+        Elige y aplica el destino de los robots que se mueven, en rondas
+        hasta que no quedan choques
+        """
+        # Prioridad de este paso: menor gana la celda
+        priority = self.rng.permutation(self.num_robots)
+        # Ocupación del inicio del paso: las celdas que se desocupan en este
+        # paso siguen bloqueadas; cada ronda agrega las que ya se tomaron
+        blocked = self.robots > 0
+        pending = movers
+        while pending.size:
+            target = self._choose(pending, distance, blocked)
+            has_target = target >= 0
+            pending, target = pending[has_target], target[has_target]
+            if not pending.size:
+                break
+            # Por celda destino, el primero en prioridad la toma
+            order = np.lexsort((priority[pending], target))
+            pending, target = pending[order], target[order]
+            first = np.ones(target.size, dtype=bool)
+            first[1:] = target[1:] != target[:-1]
+            winners, cells = pending[first], target[first]
+
+            blocked[cells] = True
+            self.robots[self.position[winners]] -= 1
+            self.robots[cells] += 1
+            self.position[winners] = cells
+            self._mark_visited(winners, cells)
+            self.battery[winners] -= 1
+            self.move_count[winners] += 1
+            # RandomAgent.movement suma dos veces al move_count del modelo
+            self.move_count_total += 2 * winners.size
+            pending = pending[~first]
+
+    def _choose(self, robots, distance, blocked):
+        """
+        Celda destino de cada robot (-1 si no se mueve). Sólo cuentan las
+        vecinas sin obstáculo, sin robot al inicio del paso y no tomadas en
+        una ronda anterior
+        """
+        candidates = self.neighbors[self.position[robots]]
+        safe = np.maximum(candidates, 0)
+        free = (candidates >= 0) & ~blocked[safe]
+        target = np.full(robots.size, -1, dtype=np.int64)
+        row = np.arange(robots.size)
+
+        returning = self.mode[robots] == RETURN
+        if returning.any():
+            ids = np.flatnonzero(returning)
+            options = free[ids]
+            cost = self.distance_to_charger(robots[ids], safe[ids])
+            cost = np.where(options, cost, np.iinfo(np.int64).max)
+            # argmin toma la primera vecina con la menor distancia, como el ciclo con <
+            best = cost.argmin(axis=1)
+            best_cost = cost[row[:ids.size], best]
+            move = options.any(axis=1)
+            if self.field is not None:
+                # Con el campo sólo se baja; si no, se espera
+                move &= best_cost < distance[robots[ids]]
+            target[ids[move]] = safe[ids[move], best[move]]
+
+        exploring = ~returning
+        if exploring.any():
+            ids = np.flatnonzero(exploring)
+            options = free[ids]
+            cells = safe[ids]
+            dirty = options & self.dirty[cells]
+            unvisited = (
+                options & ~self.dirty[cells]
+                & ~self._was_visited(robots[ids][:, None], cells)
+            )
+            # Prioridad: sucias, luego limpias no visitadas, luego cualquiera libre
+            mask = np.where(
+                dirty.any(axis=1)[:, None], dirty,
+                np.where(unvisited.any(axis=1)[:, None], unvisited, options),
+            )
+            counts = mask.sum(axis=1)
+            move = counts > 0
+            # k-ésima opción al azar, uniforme entre las de la máscara
+            k = (self.rng.random(ids.size) * counts).astype(np.int64)
+            pick = (np.cumsum(mask, axis=1) == (k + 1)[:, None]) & mask
+            choice = pick.argmax(axis=1)
+            target[ids[move]] = cells[move, choice[move]]
+        return target
+
+    def run(self, steps=None):
+        """
+        Corre hasta que termina la simulación (o steps pasos como máximo)
+        """
+        count = 0
+        while self.running and (steps is None or count < steps):
+            self.step()
+            count += 1
+        return self
+
+    def battery_stats(self):
+        """
+        {"min", "mean", "max"} de la batería de los robots
+        """
+        if not self.num_robots:
+            return {"min": 0, "mean": 0.0, "max": 0}
+        return {
+            "min": int(self.battery.min()),
+            "mean": float(self.battery.mean()),
+            "max": int(self.battery.max()),
+        }
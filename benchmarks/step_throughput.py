@@ -0,0 +1,191 @@
+"""Velocidad de step de los cuatro modelos (game_of_life y Roomba).
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/step_throughput.py --sizes 50 100 200 --agents 1 5 10 \\
+        --densities 0.2 0.5 --steps 200 --output step_throughput.csv
+
+Por cada configuración (modelo x tamaño x agentes x densidad x backend) se
+mide el tiempo de construcción, steps/seg y el pico de RSS. Cada
+configuración corre en un proceso nuevo (spawn): así el pico de RSS es sólo
+de esa configuración y los dos paquetes ``game_of_life`` no chocan.
+
+El resultado es un CSV con una fila por configuración y el commit actual en
+la columna ``commit``, para comparar corridas entre commits.
+"""
+
+import argparse
+import ast
+import csv
+import importlib
+import itertools
+import multiprocessing
+import resource
+import subprocess
+import sys
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# nombre -> (carpeta que se agrega a sys.path, módulo, clase)
+MODELS = {
+    "Celular_Sim1": ("Actividad_Celular/Celular_Sim1", "game_of_life.model", "ConwaysGameOfLife"),
+    "Celular_Sim2": ("Actividad_Celular/Celular_Sim2", "game_of_life.model", "ConwaysGameOfLife"),
+    "Simulacion_1": ("Actividad_Roomba/Simulacion_1", "simulacion_1.model", "RandomModel"),
+    "Simulacion_2": ("Actividad_Roomba/Simulacion_2", "simulacion_2.model", "RandomModel"),
+}
+GAME_OF_LIFE = ("Celular_Sim1", "Celular_Sim2")
+# Simulacion_2 también se puede medir con el motor por lotes (simulacion_2.swarm)
+SWARM_BACKENDS = ("agents", "swarm")
+
+FIELDS = [
+    "commit",
+    "model",
+    "backend",
+    "size",
+    "num_agents",
+    "density",
+    "seed",
+    "construct_s",
+    "steps",
+    "step_s",
+    "steps_per_s",
+    "peak_rss_kb",
+]
+
+
+def current_commit():
+    """Hash corto de HEAD, o '' si no es un repositorio git."""
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+    except OSError:
+        return ""
+    return out.stdout.strip()
+
+
+def model_kwargs(config, steps):
+    """Parámetros del constructor para una configuración."""
+    size, density = config["size"], config["density"]
+    if config["model"] in GAME_OF_LIFE:
+        backend = config["backend"]
+        return {
+            "width": size,
+            "height": size,
+            "initial_fraction_alive": density,
+            "backend": backend,
+            "headless": backend != "agents",
+            "seed": config["seed"],
+        }
+    kwargs = {"width": size, "height": size, "dirty_percent": density, "max_steps": steps, "seed": config["seed"]}
+    if config["model"] == "Simulacion_2":
+        kwargs["num_agents"] = config["num_agents"]
+        if config["backend"] == "swarm":
+            kwargs["headless"] = True
+    return kwargs
+
+
+def run_config(config, steps):
+    """Corre una configuración en este proceso y regresa su fila de resultados."""
+    warnings.simplefilter("ignore")
+    folder, module_name, class_name = MODELS[config["model"]]
+    sys.path.insert(0, str(ROOT / folder))
+    model_class = getattr(importlib.import_module(module_name), class_name)
+
+    start = time.perf_counter()
+    model = model_class(**model_kwargs(config, steps))
+    if config["backend"] == "swarm":
+        model = importlib.import_module("simulacion_2.swarm").SwarmEngine(model)
+    construct_s = time.perf_counter() - start
+
+    done = 0
+    start = time.perf_counter()
+    while model.running and done < steps:
+        model.step()
+        done += 1
+    step_s = time.perf_counter() - start
+
+    return {
+        **config,
+        "construct_s": round(construct_s, 6),
+        "steps": done,
+        "step_s": round(step_s, 6),
+        "steps_per_s": round(done / step_s, 3) if step_s > 0 else None,
+        # En Linux ru_maxrss está en KB
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def supported_backends(model):
+    """Backends que acepta un modelo. Para game_of_life se lee BACKENDS de su
+    model.py sin importarlo (los dos paquetes se llaman igual)."""
+    if model == "Simulacion_2":
+        return SWARM_BACKENDS
+    if model not in GAME_OF_LIFE:
+        return ("agents",)
+    folder, module_name, _ = MODELS[model]
+    source = (ROOT / folder / (module_name.replace(".", "/") + ".py")).read_text(encoding="utf-8")
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.Assign) and any(getattr(t, "id", None) == "BACKENDS" for t in node.targets):
+            return tuple(ast.literal_eval(node.value))
+    return ("agents",)
+
+
+def configurations(models, sizes, agents, densities, backends, seed):
+    """Genera las configuraciones; agentes sólo aplica a Simulacion_2. De
+    backends sólo se usan los que acepta cada modelo (supported_backends);
+    las combinaciones que no aplican se saltan."""
+    for model in models:
+        model_agents = agents if model == "Simulacion_2" else [1]
+        supported = supported_backends(model)
+        model_backends = [b for b in backends if b in supported]
+        skipped = [b for b in backends if b not in supported]
+        if skipped:
+            print(f"{model}: skipping unsupported backends {skipped} (supports {list(supported)})", file=sys.stderr)
+        for size, num_agents, density, backend in itertools.product(sizes, model_agents, densities, model_backends):
+            if model in GAME_OF_LIFE:
+                num_agents = size * size  # una Cell por posición
+            yield {
+                "model": model,
+                "backend": backend,
+                "size": size,
+                "num_agents": num_agents,
+                "density": density,
+                "seed": seed,
+            }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--models", nargs="+", default=list(MODELS), choices=list(MODELS))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 50, 100])
+    parser.add_argument("--agents", type=int, nargs="+", default=[1, 5, 10])
+    parser.add_argument("--densities", type=float, nargs="+", default=[0.2, 0.5])
+    parser.add_argument("--backends", nargs="+", default=["agents", "numpy"])
+    parser.add_argument("--steps", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default="step_throughput.csv")
+    args = parser.parse_args(argv)
+
+    commit = current_commit()
+    configs = configurations(args.models, args.sizes, args.agents, args.densities, args.backends, args.seed)
+    context = multiprocessing.get_context("spawn")
+    with open(args.output, "w", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=FIELDS)
+        writer.writeheader()
+        for config in configs:
+            # Un proceso nuevo por configuración, una a la vez para no mezclar tiempos
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                row = pool.submit(run_config, config, args.steps).result()
+            row["commit"] = commit
+            writer.writerow(row)
+            handle.flush()
+            print(
+                f"{row['model']:<13} {row['backend']:<9} size={row['size']:<5} agents={row['num_agents']:<7} "
+                f"density={row['density']:<5} {row['steps_per_s']} steps/s  {row['peak_rss_kb']} KB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""Barrido de parámetros de RandomModel (Roomba) en paralelo y reanudable.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/sweep.py --grid num_agents=1,2,5,10 dirty_percent=0.2,0.4 \\
+        obstacle_percent=0,0.1 --seeds 20 --fixed width=20 height=20 max_steps=2000 \\
+        --workers 4 --output sweep_results
+
+Se corre cada combinación de ``--grid`` (producto cartesiano) con cada seed,
+sumando los parámetros de ``--fixed``, en un pool de procesos. Cada corrida
+terminada se agrega de inmediato a ``--output``: un directorio columnar con
+un archivo binario de ancho fijo por columna (``<columna>.bin``) y
+``schema.json`` con el orden y dtype de las columnas. Si se interrumpe y se
+vuelve a lanzar con la misma salida, las combinaciones (parámetros + seed)
+que ya están se saltan. Una corrida que lanza una excepción se reporta en
+stderr y no detiene las demás; como no queda en la tabla, se reintenta al
+relanzar.
+
+Para leer los resultados: ``ColumnStore("sweep_results").to_dataframe()``.
+"""
+
+import argparse
+import ast
+import importlib
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# nombre -> (carpeta que se agrega a sys.path, paquete)
+MODELS = {
+    "Simulacion_1": ("Actividad_Roomba/Simulacion_1", "simulacion_1"),
+    "Simulacion_2": ("Actividad_Roomba/Simulacion_2", "simulacion_2"),
+}
+ENGINES = ("agents", "swarm")
+
+# Columnas de resultados (después de las de parámetros); time_to_clean es NaN si no terminó
+RESULT_DTYPES = {
+    "time_to_clean": "<f8",
+    "steps": "<i8",
+    "move_count": "<i8",
+    "cleaned_cells": "<i8",
+    "initial_dirty_cells": "<i8",
+    "battery_min": "<f8",
+    "battery_mean": "<f8",
+    "battery_max": "<f8",
+    "elapsed_s": "<f8",
+}
+
+
+def parse_value(text):
+    """'5' -> 5, '0.1' -> 0.1, 'True' -> True; cualquier otra cosa queda como str."""
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return text
+
+
+def parse_assignments(items, multiple):
+    """['a=1,2', 'b=x'] -> {'a': [1, 2], 'b': ['x']} (o {'a': 1, 'b': 'x'} si no multiple)."""
+    params = {}
+    for item in items:
+        name, sep, values = item.partition("=")
+        if not sep or not name:
+            raise ValueError(f"expected name=value, got {item!r}")
+        if multiple:
+            params[name] = [parse_value(v) for v in values.split(",")]
+        else:
+            params[name] = parse_value(values)
+    return params
+
+
+def value_dtype(value):
+    """Dtype de ancho fijo para guardar un valor de parámetro."""
+    if isinstance(value, bool):
+        return "|b1"
+    if isinstance(value, int):
+        return "<i8"
+    if isinstance(value, float):
+        return "<f8"
+    return "<U"
+
+
+class ColumnStore:
+    """
+    Tabla columnar sólo de agregar: un archivo .bin de ancho fijo por columna.
+
+    Una fila se escribe columna por columna; si el proceso se corta a la
+    mitad, al abrir se recortan todas las columnas a la última fila completa.
+    """
+    def __init__(self, path, dtypes=None):
+        """
+        args:
+            path: Directorio de la tabla
+            dtypes: {columna: dtype} para crearla; si ya existe debe coincidir
+        """
+        self.path = Path(path)
+        schema_path = self.path / "schema.json"
+        if schema_path.exists():
+            schema = json.loads(schema_path.read_text())
+            if dtypes is not None and schema != dict(dtypes):
+                raise ValueError(f"{self.path} already has columns {schema}, got {dict(dtypes)}")
+            dtypes = schema
+        elif dtypes is None:
+            raise ValueError(f"{self.path} has no schema.json")
+        else:
+            self.path.mkdir(parents=True, exist_ok=True)
+            schema_path.write_text(json.dumps(dict(dtypes), indent=1))
+        self.dtypes = {name: np.dtype(dtype) for name, dtype in dtypes.items()}
+        self.rows = self._repair()
+
+    def _file(self, name):
+        return self.path / f"{name}.bin"
+
+    def _repair(self):
+        """Recorta las columnas a la última fila completa y regresa cuántas hay."""
+        sizes = {}
+        for name, dtype in self.dtypes.items():
+            file = self._file(name)
+            sizes[name] = file.stat().st_size // dtype.itemsize if file.exists() else 0
+        rows = min(sizes.values(), default=0)
+        for name, dtype in self.dtypes.items():
+            file = self._file(name)
+            if not file.exists():
+                file.touch()
+            if file.stat().st_size != rows * dtype.itemsize:
+                os.truncate(file, rows * dtype.itemsize)
+        return rows
+
+    def append(self, row):
+        """Agrega una fila {columna: valor}."""
+        for name, dtype in self.dtypes.items():
+            with open(self._file(name), "ab") as handle:
+                handle.write(np.array(row[name], dtype=dtype).tobytes())
+        self.rows += 1
+
+    def column(self, name):
+        """Arreglo de NumPy con la columna completa."""
+        return np.fromfile(self._file(name), dtype=self.dtypes[name], count=self.rows)
+
+    def to_dataframe(self):
+        import pandas as pd
+
+        return pd.DataFrame({name: self.column(name) for name in self.dtypes})
+
+
+def completed_keys(store, names):
+    """Llaves de las corridas que ya están en la tabla."""
+    columns = [store.column(name).tolist() for name in names]
+    return set(zip(*columns))
+
+
+def run_one(model_name, engine, params):
+    """Corre una simulación hasta que termina y regresa su fila de resultados."""
+    warnings.simplefilter("ignore")
+    folder, package = MODELS[model_name]
+    if str(ROOT / folder) not in sys.path:
+        sys.path.insert(0, str(ROOT / folder))
+    model_class = importlib.import_module(f"{package}.model").RandomModel
+
+    start = time.perf_counter()
+    if engine == "swarm":
+        simulation = importlib.import_module(f"{package}.swarm").SwarmEngine.from_params(**params)
+        simulation.run()
+        batteries = simulation.battery
+        move_count = simulation.move_count_total
+        cleaned_cells = simulation.total_cleaned_cells
+    else:
+        simulation = model_class(**params)
+        while simulation.running:
+            simulation.step()
+        # Simulacion_1 tiene un solo robot (num_agent); Simulacion_2 una lista que puede estar vacía
+        cleaners = simulation.cleaners if model_name == "Simulacion_2" else [simulation.num_agent]
+        batteries = np.array([a.battery for a in cleaners], dtype=float)
+        move_count = simulation.move_count
+        cleaned_cells = simulation.cleaned_cells
+    elapsed = time.perf_counter() - start
+
+    time_to_clean = simulation.time_to_clean
+    return {
+        **params,
+        "time_to_clean": np.nan if time_to_clean is None else time_to_clean,
+        "steps": simulation.actual_step,
+        "move_count": move_count,
+        "cleaned_cells": cleaned_cells,
+        "initial_dirty_cells": simulation.initial_dirty_cells,
+        "battery_min": float(np.min(batteries)) if len(batteries) else np.nan,
+        "battery_mean": float(np.mean(batteries)) if len(batteries) else np.nan,
+        "battery_max": float(np.max(batteries)) if len(batteries) else np.nan,
+        "elapsed_s": elapsed,
+    }
+
+
+def combinations(grid, fixed, seeds):
+    """Genera los kwargs de cada corrida: producto de grid x seeds, más fixed."""
+    names = list(grid)
+    for values in itertools.product(*(grid[name] for name in names)):
+        for seed in seeds:
+            yield {**fixed, **dict(zip(names, values)), "seed": seed}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="Simulacion_2", choices=list(MODELS))
+    parser.add_argument("--engine", default="agents", choices=ENGINES)
+    parser.add_argument("--grid", nargs="+", default=[], metavar="NAME=V1,V2,...")
+    parser.add_argument("--fixed", nargs="*", default=[], metavar="NAME=VALUE")
+    parser.add_argument("--seeds", type=int, default=10)
+    parser.add_argument("--seed-start", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--output", default="sweep_results")
+    args = parser.parse_args(argv)
+
+    if args.engine == "swarm" and args.model != "Simulacion_2":
+        parser.error("--engine swarm only applies to Simulacion_2")
+    grid = parse_assignments(args.grid, multiple=True)
+    fixed = parse_assignments(args.fixed, multiple=False)
+    if "seed" in grid or "seed" in fixed:
+        parser.error("use --seeds/--seed-start instead of a seed parameter")
+    if args.model == "Simulacion_2" and args.engine == "agents":
+        # Sin DirtyPatch los resultados de Simulacion_2 son los mismos y construir es más rápido
+        fixed.setdefault("headless", True)
+        # Sólo se guardan los valores finales: MetricsRecorder con un intervalo
+        # largo evita el costo de DataCollector en cada paso (el último paso se registra igual)
+        fixed.setdefault("metrics_interval", 1000)
+    seeds = range(args.seed_start, args.seed_start + args.seeds)
+
+    runs = list(combinations(grid, fixed, seeds))
+    if not runs:
+        return
+    names = sorted(runs[0])
+    dtypes = {name: value_dtype(runs[0][name]) for name in names}
+    for name in names:
+        values = [run[name] for run in runs]
+        # Una columna de parámetro es float si algún valor del grid lo es
+        if dtypes[name] == "<i8" and any(isinstance(v, float) for v in values):
+            dtypes[name] = "<f8"
+        elif dtypes[name].startswith("<U"):
+            dtypes[name] = f"<U{max(len(str(v)) for v in values)}"
+    store = ColumnStore(args.output, {**dtypes, **RESULT_DTYPES})
+
+    # Las llaves se comparan ya convertidas al dtype de su columna
+    def normalized(params):
+        return tuple(np.array(params[name], dtype=dtypes[name]).item() for name in names)
+
+    done = completed_keys(store, names)
+    pending = [run for run in runs if normalized(run) not in done]
+    print(f"{len(runs)} runs, {len(runs) - len(pending)} already in {args.output}, {len(pending)} to go")
+
+    context = multiprocessing.get_context("spawn")
+    failed = 0
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=context) as pool:
+        futures = {pool.submit(run_one, args.model, args.engine, params): params for params in pending}
+        for finished, future in enumerate(as_completed(futures), 1):
+            # Una corrida que falla no se guarda (se reintenta al relanzar) ni detiene las demás
+            try:
+                row = future.result()
+            except Exception as exc:
+                failed += 1
+                params = futures[future]
+                print(
+                    f"[{finished}/{len(pending)}] FAILED "
+                    + " ".join(f"{name}={params[name]}" for name in names)
+                    + f": {type(exc).__name__}: {exc}",
+                    file=sys.stderr,
+                )
+                continue
+            store.append(row)
+            print(
+                f"[{finished}/{len(pending)}] "
+                + " ".join(f"{name}={row[name]}" for name in names)
+                + f" time_to_clean={row['time_to_clean']} moves={row['move_count']}"
+            )
+    if failed:
+        print(f"{failed} runs failed; rerun with the same --output to retry them", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()